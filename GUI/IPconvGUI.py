@@ -22,10 +22,29 @@
 import wx
 import wx.adv
 import wx.lib.agw.persist as pm
-from .IPconvGUIbase import BaseConverterFrame, BaseSettingsFrame
+from libIPconv.globals import ADDRTYPE
+from .IPconvGUIbase import BaseBatchFrame, BaseConverterFrame, BaseSettingsFrame
 from .resources import *
 
 
+# Settings that are needed before the settings window is built, read from the saved persistence values.
+# Name of the control in SettingsFrame: (persistence kind, value key, default matching BaseSettingsFrame)
+SETTINGS = {
+    'checkbox_monitorclipboard': (pm.PERSIST_CHECKBOX_KIND, pm.PERSIST_CHECKBOX, False),
+    'checkbox_stayontop': (pm.PERSIST_CHECKBOX_KIND, pm.PERSIST_CHECKBOX, True),
+    'radio_box_theme': (pm.PERSIST_RADIOBOX_KIND, pm.PERSIST_RADIOBOX_SELECTION, 1),
+    'spin_ctrl_textdelay': (pm.PERSIST_SPIN_KIND, pm.PERSIST_SPIN_VALUE, 100),
+    'spin_ctrl_pollmin': (pm.PERSIST_SPIN_KIND, pm.PERSIST_SPIN_VALUE, 250),
+    'spin_ctrl_pollmax': (pm.PERSIST_SPIN_KIND, pm.PERSIST_SPIN_VALUE, 4000)
+}
+
+# Events that change the value of each kind of SETTINGS control
+SETTING_EVENTS = {
+    pm.PERSIST_CHECKBOX_KIND: (wx.EVT_CHECKBOX,),
+    pm.PERSIST_RADIOBOX_KIND: (wx.EVT_RADIOBOX,),
+    pm.PERSIST_SPIN_KIND: (wx.EVT_SPINCTRL, wx.EVT_TEXT)
+}
+
 # ctrl-[A,C,V,X,Z], shift-insert
 ctrl_ascii_chars = [
     wx.WXK_CONTROL_A, wx.WXK_CONTROL_C, wx.WXK_CONTROL_V, wx.WXK_CONTROL_X, wx.WXK_CONTROL_Z, wx.WXK_INSERT
@@ -41,7 +60,14 @@ class IPConverterFrame(BaseConverterFrame):
         # Last selected text control is remembered for use with reverse checkbox callback
         self.last_selected = self.text_ctrl_hex
 
-        self.settings_window = SettingsFrame(self, name='SettingsFrame')
+        # The settings and batch windows are built the first time they are opened, see settings_window
+        self._settings_window = None
+        self._batch_window = None
+
+        # Clipboard polling starts at the minimum interval and backs off while the clipboard is unchanged
+        self._clipboard_timer = None
+        self._clipboard_interval = 0
+        self._clipboard_signature = None
 
         self.themes = {
             'dark': {
@@ -99,16 +125,40 @@ class IPConverterFrame(BaseConverterFrame):
 
         # Restore any saved selections and window placement
         self.persistence_manager.RegisterAndRestore(self)
-        self.persistence_manager.RegisterAndRestoreAll(
-            self, children=[
-                self.checkbox_reverse, self.settings_window.checkbox_monitorclipboard,
-                self.settings_window.checkbox_stayontop, self.settings_window.radio_box_theme
-            ]
-        )
+        self.persistence_manager.RegisterAndRestoreAll(self, children=[self.checkbox_reverse])
 
-        self.apply_theme(theme_name=self.settings_window.radio_box_theme.GetStringSelection())
+        # SETTINGS values are read from the saved settings once, then kept up to date by the settings window
+        self.settings = {setting_name: self.restore_setting(setting_name) for setting_name in SETTINGS}
+
+        self.apply_theme(theme_name=self.get_theme_name())
         self.monitor_clipboard_start()
-        self.stay_on_top(enable=self.settings_window.checkbox_stayontop.IsChecked())
+        self.stay_on_top(enable=self.get_setting('checkbox_stayontop'))
+
+    @property
+    def settings_window(self):
+        """The SettingsFrame, built and restored from saved settings on first use"""
+        if self._settings_window is None:
+            self._settings_window = SettingsFrame(self, name='SettingsFrame')
+            self.persistence_manager.RegisterAndRestoreAll(
+                self._settings_window, children=[
+                    getattr(self._settings_window, setting_name) for setting_name in SETTINGS
+                ]
+            )
+            for setting_name, (kind, value_key, default) in SETTINGS.items():
+                control = getattr(self._settings_window, setting_name)
+                self.settings[setting_name] = self.get_control_value(kind, control)
+                for event_type in SETTING_EVENTS[kind]:
+                    # Bound on the control so the value is current before the SettingsFrame handlers run
+                    control.Bind(event_type, lambda event, name=setting_name: self.on_setting_changed(event, name))
+        return self._settings_window
+
+    @property
+    def batch_window(self):
+        """The BatchFrame, built and restored to its saved placement on first use"""
+        if self._batch_window is None:
+            self._batch_window = BatchFrame(self, name='BatchFrame')
+            self.persistence_manager.RegisterAndRestore(self._batch_window)
+        return self._batch_window
 
     def apply_theme(self, theme_name: str):
         theme = self.themes.get(theme_name, None)
@@ -148,6 +198,31 @@ class IPConverterFrame(BaseConverterFrame):
 
         self.Refresh()
 
+    @staticmethod
+    def get_control_value(kind: str, control):
+        """Return the value of a SETTINGS control in the form it is saved"""
+        return control.GetSelection() if (kind == pm.PERSIST_RADIOBOX_KIND) else control.GetValue()
+
+    def get_setting(self, setting_name: str):
+        """Return the current value of a SETTINGS control without building the settings window"""
+        return self.settings[setting_name]
+
+    def get_theme_name(self) -> str:
+        return ('dark', 'light')[self.get_setting('radio_box_theme')]
+
+    def restore_setting(self, setting_name: str):
+        """Read the saved value of a SETTINGS control, or its default if it was never saved"""
+        kind, value_key, default = SETTINGS[setting_name]
+        saved_value = self.persistence_manager.RestoreValue(_SavedSetting(kind, setting_name), value_key)
+        return default if (saved_value is None) else saved_value
+
+    def save_settings(self):
+        """Write the SETTINGS values, so they are saved even if the settings window was never built"""
+        for setting_name, (kind, value_key, default) in SETTINGS.items():
+            self.persistence_manager.SaveValue(
+                _SavedSetting(kind, setting_name), value_key, self.settings[setting_name]
+            )
+
     @staticmethod
     def get_clipboard_string() -> tuple:
         """Try to get text data from the clipboard and return a tuple indicating success and the text value"""
@@ -161,31 +236,67 @@ class IPConverterFrame(BaseConverterFrame):
             clipboard_string = text_data.GetText()
         return success, clipboard_string
 
+    @staticmethod
+    def set_clipboard_string(text: str) -> bool:
+        """Try to put text on the clipboard and return whether it succeeded"""
+        success = False
+        if wx.TheClipboard.Open():
+            success = wx.TheClipboard.SetData(wx.TextDataObject(text))
+            wx.TheClipboard.Close()
+        return success
+
+    def get_clipboard_poll_bounds(self) -> tuple:
+        """Return the (minimum, maximum) clipboard poll interval in milliseconds from the settings"""
+        poll_min = self.get_setting('spin_ctrl_pollmin')
+        return poll_min, max(poll_min, self.get_setting('spin_ctrl_pollmax'))
+
     def monitor_clipboard(self):
-        """Monitor the clipboard when this application does not have focus"""
-        if self.settings_window.checkbox_monitorclipboard.IsChecked() and (not self.IsActive()):
+        """
+        Monitor the clipboard when this application does not have focus.
+        The text is returned only when it changed since the last check, otherwise it is None.
+        """
+        if self.get_setting('checkbox_monitorclipboard') and (not self.IsActive()):
+            success, clipboard_string = self.get_clipboard_string()
+            # Cheap check so unchanged content is not processed again
+            signature = (len(clipboard_string), hash(clipboard_string))
+            poll_min, poll_max = self.get_clipboard_poll_bounds()
+            if signature != self._clipboard_signature:
+                self._clipboard_signature = signature
+                self._clipboard_interval = poll_min
+            else:
+                clipboard_string = None
+                self._clipboard_interval = min(self._clipboard_interval * 2, poll_max)
             # Submit another run to start later
-            self.monitor_clipboard_start()
+            self._clipboard_timer = wx.CallLater(self._clipboard_interval, self.monitor_clipboard)
             # Return the data, which should be used in a subclass
-            return self.get_clipboard_string()
+            return success, clipboard_string
         else:
+            self._clipboard_timer = None
             return None, None
 
     def monitor_clipboard_start(self):
-        """Submit a delayed call for monitoring. This is useful to allow event handlers to complete beforehand."""
-        wx.CallLater(1000, self.monitor_clipboard)
+        """
+        Submit a delayed call for monitoring at the minimum interval. This is useful to allow event handlers
+        to complete beforehand. A pending call is rescheduled instead of starting another one.
+        """
+        self._clipboard_interval = self.get_clipboard_poll_bounds()[0]
+        if self._clipboard_timer and self._clipboard_timer.IsRunning():
+            self._clipboard_timer.Start(self._clipboard_interval)
+        else:
+            self._clipboard_timer = wx.CallLater(self._clipboard_interval, self.monitor_clipboard)
 
     def on_activate(self, event):
         """This is triggered when the user changes focus between this application and others"""
         # Check for valid self in case window has been destroyed (avoids exception when closing the program)
-        if self and self.settings_window:
+        if self:
             # Start monitoring clipboard if we're configured to and another application has focus
-            if self.settings_window.checkbox_monitorclipboard.IsChecked() and (not event.GetActive()):
+            if self.get_setting('checkbox_monitorclipboard') and (not event.GetActive()):
                 self.monitor_clipboard_start()
         event.Skip()
 
     def on_button_exit(self, event):
         """Save window position and settings when the user presses the button to close the application"""
+        self.save_settings()
         self.persistence_manager.SaveAndUnregister()
         self.Close(force=True)
 
@@ -258,10 +369,24 @@ class IPConverterFrame(BaseConverterFrame):
         """This will get the value from the clipboard and return a success indicator and string in a tuple"""
         return self.get_clipboard_string()
 
+    def on_setting_changed(self, event, setting_name: str):
+        """Keep settings in sync with a SETTINGS control of the settings window"""
+        kind = SETTINGS[setting_name][0]
+        self.settings[setting_name] = self.get_control_value(kind, getattr(self._settings_window, setting_name))
+        event.Skip()
+
     def on_text(self, event):
         print("Event handler 'on_text' not implemented!")
         event.Skip()
 
+    def show_batch_window(self):
+        """Open the batch conversion window, or focus it if it's already open."""
+        if self.batch_window.IsShown():
+            self.batch_window.Raise()
+        else:
+            self.batch_window.Show()
+        self.batch_window.list_ctrl_batch.SetFocus()
+
     def stay_on_top(self, enable: bool = True):
         if enable:
             # Binary OR wx.STAY_ON_TOP to add it if it's not already present
@@ -271,6 +396,19 @@ class IPConverterFrame(BaseConverterFrame):
             self.SetWindowStyle(self.GetWindowStyle() ^ wx.STAY_ON_TOP)
 
 
+class _SavedSetting(object):
+    """Stand-in for a persistent control, which is all PersistenceManager needs to read or write its saved value"""
+    def __init__(self, kind: str, name: str):
+        self._kind = kind
+        self._name = name
+
+    def GetKind(self) -> str:
+        return self._kind
+
+    def GetName(self) -> str:
+        return self._name
+
+
 class SettingsFrame(BaseSettingsFrame):
     def __init__(self, *args, **kwds):
         kwds["style"] = kwds.get("style", 0)
@@ -280,6 +418,9 @@ class SettingsFrame(BaseSettingsFrame):
         self.checkbox_monitorclipboard.SetName('checkbox_monitorclipboard')
         self.checkbox_stayontop.SetName('checkbox_stayontop')
         self.radio_box_theme.SetName('radio_box_theme')
+        self.spin_ctrl_textdelay.SetName('spin_ctrl_textdelay')
+        self.spin_ctrl_pollmin.SetName('spin_ctrl_pollmin')
+        self.spin_ctrl_pollmax.SetName('spin_ctrl_pollmax')
 
     def on_about(self, event):
         program_description = \
@@ -300,6 +441,9 @@ class SettingsFrame(BaseSettingsFrame):
 
         wx.adv.AboutBox(info, parent=self)
 
+    def on_button_batch(self, event):
+        self.Parent.show_batch_window()
+
     def on_checkbox_monitorclipboard(self, event):
         if event.IsChecked():
             self.Parent.monitor_clipboard_start()
@@ -320,3 +464,113 @@ class SettingsFrame(BaseSettingsFrame):
     def on_radiobox_theme(self, event):
         self.Parent.apply_theme(event.GetString())
         event.Skip()
+
+
+class BatchFrame(BaseBatchFrame):
+    """
+    Window for converting thousands of addresses at once. The addresses are kept packed in
+    list_ctrl_batch.table and the virtual list only converts the rows it draws.
+    """
+    # ADDRTYPE for each choice_input and choice_copy item
+    input_types = (ADDRTYPE.NONE, ADDRTYPE.DOTTED, ADDRTYPE.HEX, ADDRTYPE.DEC)
+    copy_types = (ADDRTYPE.DOTTED, ADDRTYPE.HEX, ADDRTYPE.DEC)
+
+    def __init__(self, *args, **kwds):
+        BaseBatchFrame.__init__(self, *args, **kwds)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.list_ctrl_batch.Bind(wx.EVT_KEY_DOWN, self.on_key)
+
+        # None until a column heading is clicked, then whether the rows are sorted largest first
+        self.sort_descending = None
+        self.skipped_count = 0
+        self.update_status()
+
+    def add_text(self, text: str):
+        """Add the valid addresses in text after the current rows"""
+        self.skipped_count += self.list_ctrl_batch.table.add_text(
+            text, self.input_types[self.choice_input.GetSelection()]
+        )
+        self.sort_descending = None
+        self.list_ctrl_batch.refresh_rows()
+        self.update_status()
+
+    def clear_selection(self):
+        """Deselect all rows, since selections are row numbers and do not follow the values when sorting"""
+        self.list_ctrl_batch.SetItemState(-1, 0, wx.LIST_STATE_SELECTED)
+
+    def copy_rows(self):
+        """Copy the selected rows, or all rows if none are selected, to the clipboard"""
+        list_ctrl = self.list_ctrl_batch
+        selected_rows = list_ctrl.get_selected_rows() if list_ctrl.GetSelectedItemCount() else None
+        output_type = self.copy_types[self.choice_copy.GetSelection()]
+        text = list_ctrl.table.to_text(output_type, selected_rows, list_ctrl.reverse)
+        if text and not IPConverterFrame.set_clipboard_string(text):
+            wx.LogError('Unable to open the clipboard')
+
+    def on_button_clear(self, event):
+        self.clear_selection()
+        self.list_ctrl_batch.table.clear()
+        self.sort_descending = None
+        self.skipped_count = 0
+        self.list_ctrl_batch.refresh_rows()
+        self.update_status()
+
+    def on_button_copy(self, event):
+        self.copy_rows()
+
+    def on_button_load(self, event):
+        with wx.FileDialog(self, 'Load addresses', wildcard='Text files (*.txt)|*.txt|All files (*.*)|*.*',
+                           style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as file_dialog:
+            if file_dialog.ShowModal() == wx.ID_CANCEL:
+                return
+            path = file_dialog.GetPath()
+        try:
+            with open(path, 'r', errors='replace') as input_file:
+                self.add_text(input_file.read())
+        except OSError as error:
+            wx.LogError(f'Unable to read {path}: {error}')
+
+    def on_button_paste(self, event):
+        success, clipboard_string = IPConverterFrame.get_clipboard_string()
+        if success:
+            self.add_text(clipboard_string)
+
+    def on_checkbox_reverse(self, event):
+        self.list_ctrl_batch.reverse = event.IsChecked()
+        # The displayed values changed, so the rows are no longer in sorted order
+        self.sort_descending = None
+        self.list_ctrl_batch.Refresh()
+        self.update_status()
+
+    def on_close(self, event):
+        """Hide the window when the user clicks the close button, keeping the addresses"""
+        if event.CanVeto():
+            self.Hide()
+            event.Veto()
+        else:
+            event.Skip()
+
+    def on_column_click(self, event):
+        """Sort by value, every column has the same order. Clicking again toggles the direction."""
+        self.sort_descending = (self.sort_descending is False)
+        self.clear_selection()
+        self.list_ctrl_batch.table.sort(self.sort_descending, self.list_ctrl_batch.reverse)
+        self.list_ctrl_batch.Refresh()
+        self.update_status()
+
+    def on_key(self, event):
+        """Copy with Ctrl-C and paste with Ctrl-V while the list has focus"""
+        if event.ControlDown() and (event.GetKeyCode() == ord('C')):
+            self.copy_rows()
+        elif event.ControlDown() and (event.GetKeyCode() == ord('V')):
+            self.on_button_paste(event)
+        else:
+            event.Skip()
+
+    def update_status(self):
+        status = f'{len(self.list_ctrl_batch.table)} addresses'
+        if self.skipped_count:
+            status += f', {self.skipped_count} invalid values skipped'
+        if self.sort_descending is not None:
+            status += ', sorted descending' if self.sort_descending else ', sorted ascending'
+        self.label_status.SetLabel(status)
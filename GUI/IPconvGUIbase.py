@@ -30,6 +30,8 @@ from .resources import *
 # You should have received a copy of the GNU Lesser General Public
 # License along with Quick IP Converter.
 # If not, see <https://www.gnu.org/licenses/>.
+
+from .batchlist import BatchListCtrl
 # end wxGlade
 
 
@@ -143,6 +145,12 @@ class BaseSettingsFrame(wx.Frame):
         self.checkbox_monitorclipboard = wx.CheckBox(self.panel_settings, wx.ID_ANY, "monitor clipboard")
         self.checkbox_stayontop = wx.CheckBox(self.panel_settings, wx.ID_ANY, "stay on top")
         self.radio_box_theme = wx.RadioBox(self.panel_settings, wx.ID_ANY, "theme", choices=["dark", "light"], majorDimension=0, style=wx.RA_SPECIFY_ROWS)
+        self.label_textdelay = wx.StaticText(self.panel_settings, wx.ID_ANY, "typing delay (ms)")
+        self.spin_ctrl_textdelay = wx.SpinCtrl(self.panel_settings, wx.ID_ANY, "100", min=0, max=1000)
+        self.label_pollinterval = wx.StaticText(self.panel_settings, wx.ID_ANY, "clipboard poll (ms)")
+        self.spin_ctrl_pollmin = wx.SpinCtrl(self.panel_settings, wx.ID_ANY, "250", min=50, max=10000)
+        self.spin_ctrl_pollmax = wx.SpinCtrl(self.panel_settings, wx.ID_ANY, "4000", min=50, max=60000)
+        self.button_batch = wx.Button(self.panel_settings, wx.ID_ANY, "batch conversion...")
         self.hyperlink_about = wx.adv.HyperlinkCtrl(self.panel_settings, wx.ID_ANY, "About this program", "", style=wx.adv.HL_ALIGN_CENTRE)
 
         self.__set_properties()
@@ -151,26 +159,41 @@ class BaseSettingsFrame(wx.Frame):
         self.Bind(wx.EVT_CHECKBOX, self.on_checkbox_monitorclipboard, self.checkbox_monitorclipboard)
         self.Bind(wx.EVT_CHECKBOX, self.on_checkbox_stayontop, self.checkbox_stayontop)
         self.Bind(wx.EVT_RADIOBOX, self.on_radiobox_theme, self.radio_box_theme)
+        self.Bind(wx.EVT_BUTTON, self.on_button_batch, self.button_batch)
         self.Bind(wx.adv.EVT_HYPERLINK, self.on_about, self.hyperlink_about)
         # end wxGlade
 
     def __set_properties(self):
         # begin wxGlade: BaseSettingsFrame.__set_properties
         self.SetTitle("Settings")
-        self.checkbox_monitorclipboard.SetToolTip("monitor clipboard every second for hex or dotted-quad values")
+        self.checkbox_monitorclipboard.SetToolTip("monitor clipboard for hex or dotted-quad values")
         self.checkbox_monitorclipboard.SetFocus()
         self.checkbox_stayontop.SetToolTip("always stay on top of other windows")
         self.checkbox_stayontop.SetValue(1)
         self.radio_box_theme.SetSelection(1)
+        self.spin_ctrl_textdelay.SetToolTip("minimum time between conversions while typing or pasting, 0 converts on every change")
+        self.spin_ctrl_pollmin.SetToolTip("clipboard poll interval right after the clipboard changes")
+        self.spin_ctrl_pollmax.SetToolTip("longest clipboard poll interval, reached by doubling while the clipboard is unchanged")
+        self.button_batch.SetToolTip("open a window for converting long lists of addresses")
         # end wxGlade
 
     def __do_layout(self):
         # begin wxGlade: BaseSettingsFrame.__do_layout
         sizer_main = wx.BoxSizer(wx.VERTICAL)
         sizer_panel = wx.BoxSizer(wx.VERTICAL)
+        sizer_pollinterval = wx.BoxSizer(wx.HORIZONTAL)
+        sizer_textdelay = wx.BoxSizer(wx.HORIZONTAL)
         sizer_panel.Add(self.checkbox_monitorclipboard, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
         sizer_panel.Add(self.checkbox_stayontop, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
         sizer_panel.Add(self.radio_box_theme, 0, wx.ALIGN_CENTER | wx.ALL | wx.EXPAND, 2)
+        sizer_textdelay.Add(self.label_textdelay, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_textdelay.Add(self.spin_ctrl_textdelay, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_panel.Add(sizer_textdelay, 0, wx.EXPAND, 0)
+        sizer_pollinterval.Add(self.label_pollinterval, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_pollinterval.Add(self.spin_ctrl_pollmin, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_pollinterval.Add(self.spin_ctrl_pollmax, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_panel.Add(sizer_pollinterval, 0, wx.EXPAND, 0)
+        sizer_panel.Add(self.button_batch, 0, wx.ALIGN_CENTER | wx.ALL, 2)
         sizer_panel.Add(self.hyperlink_about, 0, wx.ALIGN_CENTER | wx.ALL, 2)
         self.panel_settings.SetSizer(sizer_panel)
         sizer_main.Add(self.panel_settings, 1, wx.EXPAND, 0)
@@ -191,12 +214,119 @@ class BaseSettingsFrame(wx.Frame):
         print("Event handler 'on_radiobox_theme' not implemented!")
         event.Skip()
 
+    def on_button_batch(self, event):  # wxGlade: BaseSettingsFrame.<event_handler>
+        print("Event handler 'on_button_batch' not implemented!")
+        event.Skip()
+
     def on_about(self, event):  # wxGlade: BaseSettingsFrame.<event_handler>
         print("Event handler 'on_about' not implemented!")
         event.Skip()
 
 # end of class BaseSettingsFrame
 
+class BaseBatchFrame(wx.Frame):
+    def __init__(self, *args, **kwds):
+        # begin wxGlade: BaseBatchFrame.__init__
+        kwds["style"] = kwds.get("style", 0) | wx.DEFAULT_FRAME_STYLE | wx.FRAME_FLOAT_ON_PARENT | wx.TAB_TRAVERSAL
+        wx.Frame.__init__(self, *args, **kwds)
+        self.SetSize((420, 480))
+        self.panel_batch = wx.Panel(self, wx.ID_ANY, style=wx.CLIP_CHILDREN)
+        self.label_input = wx.StaticText(self.panel_batch, wx.ID_ANY, "from")
+        self.choice_input = wx.Choice(self.panel_batch, wx.ID_ANY, choices=["auto", "dotted", "hex", "dec"])
+        self.button_paste = wx.Button(self.panel_batch, wx.ID_ANY, "Paste")
+        self.button_load = wx.Button(self.panel_batch, wx.ID_ANY, "Load...")
+        self.button_clear = wx.Button(self.panel_batch, wx.ID_ANY, "Clear")
+        self.list_ctrl_batch = BatchListCtrl(self.panel_batch, wx.ID_ANY, style=wx.BORDER_SUNKEN | wx.LC_REPORT | wx.LC_VIRTUAL)
+        self.checkbox_reverse = wx.CheckBox(self.panel_batch, wx.ID_ANY, "Reverse")
+        self.label_copy = wx.StaticText(self.panel_batch, wx.ID_ANY, "copy as")
+        self.choice_copy = wx.Choice(self.panel_batch, wx.ID_ANY, choices=["dotted", "hex", "dec"])
+        self.button_copy = wx.Button(self.panel_batch, wx.ID_ANY, "Copy")
+        self.label_status = wx.StaticText(self.panel_batch, wx.ID_ANY, "")
+
+        self.__set_properties()
+        self.__do_layout()
+
+        self.Bind(wx.EVT_BUTTON, self.on_button_paste, self.button_paste)
+        self.Bind(wx.EVT_BUTTON, self.on_button_load, self.button_load)
+        self.Bind(wx.EVT_BUTTON, self.on_button_clear, self.button_clear)
+        self.Bind(wx.EVT_LIST_COL_CLICK, self.on_column_click, self.list_ctrl_batch)
+        self.Bind(wx.EVT_CHECKBOX, self.on_checkbox_reverse, self.checkbox_reverse)
+        self.Bind(wx.EVT_BUTTON, self.on_button_copy, self.button_copy)
+        # end wxGlade
+
+    def __set_properties(self):
+        # begin wxGlade: BaseBatchFrame.__set_properties
+        self.SetTitle("Batch conversion")
+        _icon = wx.NullIcon
+        _icon.CopyFromBitmap(IPconvIcon.GetBitmap())
+        self.SetIcon(_icon)
+        self.choice_input.SetToolTip("type of the pasted or loaded values, auto reads values with only digits as decimal")
+        self.choice_input.SetSelection(0)
+        self.button_paste.SetToolTip("add the values on the clipboard, separated by whitespace or new lines")
+        self.button_load.SetToolTip("add the values from a text file")
+        self.button_clear.SetToolTip("remove all addresses")
+        self.list_ctrl_batch.SetToolTip("click a column heading to sort by value")
+        self.list_ctrl_batch.AppendColumn("IP", format=wx.LIST_FORMAT_LEFT, width=130)
+        self.list_ctrl_batch.AppendColumn("Hex", format=wx.LIST_FORMAT_LEFT, width=100)
+        self.list_ctrl_batch.AppendColumn("Dec", format=wx.LIST_FORMAT_LEFT, width=110)
+        self.checkbox_reverse.SetToolTip("Reverse the byte order of every address")
+        self.choice_copy.SetToolTip("format used when copying to the clipboard")
+        self.choice_copy.SetSelection(0)
+        self.button_copy.SetToolTip("copy the selected addresses, or all of them if none are selected")
+        # end wxGlade
+
+    def __do_layout(self):
+        # begin wxGlade: BaseBatchFrame.__do_layout
+        sizer_batch_main = wx.BoxSizer(wx.VERTICAL)
+        sizer_batch_panel = wx.BoxSizer(wx.VERTICAL)
+        sizer_batch_output = wx.BoxSizer(wx.HORIZONTAL)
+        sizer_batch_input = wx.BoxSizer(wx.HORIZONTAL)
+        sizer_batch_input.Add(self.label_input, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_input.Add(self.choice_input, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_input.Add(self.button_paste, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_input.Add(self.button_load, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_input.Add(self.button_clear, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_panel.Add(sizer_batch_input, 0, wx.EXPAND, 0)
+        sizer_batch_panel.Add(self.list_ctrl_batch, 1, wx.ALL | wx.EXPAND, 2)
+        sizer_batch_output.Add(self.checkbox_reverse, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_output.Add((0, 0), 1, 0, 0)
+        sizer_batch_output.Add(self.label_copy, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_output.Add(self.choice_copy, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_output.Add(self.button_copy, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 2)
+        sizer_batch_panel.Add(sizer_batch_output, 0, wx.EXPAND, 0)
+        sizer_batch_panel.Add(self.label_status, 0, wx.ALL | wx.EXPAND, 2)
+        self.panel_batch.SetSizer(sizer_batch_panel)
+        sizer_batch_main.Add(self.panel_batch, 1, wx.EXPAND, 0)
+        self.SetSizer(sizer_batch_main)
+        self.Layout()
+        # end wxGlade
+
+    def on_button_paste(self, event):  # wxGlade: BaseBatchFrame.<event_handler>
+        print("Event handler 'on_button_paste' not implemented!")
+        event.Skip()
+
+    def on_button_load(self, event):  # wxGlade: BaseBatchFrame.<event_handler>
+        print("Event handler 'on_button_load' not implemented!")
+        event.Skip()
+
+    def on_button_clear(self, event):  # wxGlade: BaseBatchFrame.<event_handler>
+        print("Event handler 'on_button_clear' not implemented!")
+        event.Skip()
+
+    def on_column_click(self, event):  # wxGlade: BaseBatchFrame.<event_handler>
+        print("Event handler 'on_column_click' not implemented!")
+        event.Skip()
+
+    def on_checkbox_reverse(self, event):  # wxGlade: BaseBatchFrame.<event_handler>
+        print("Event handler 'on_checkbox_reverse' not implemented!")
+        event.Skip()
+
+    def on_button_copy(self, event):  # wxGlade: BaseBatchFrame.<event_handler>
+        print("Event handler 'on_button_copy' not implemented!")
+        event.Skip()
+
+# end of class BaseBatchFrame
+
 class IPConverterApp(wx.App):
     def OnInit(self):
         self.frame_main = BaseConverterFrame(None, wx.ID_ANY, "")
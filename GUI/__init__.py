@@ -19,4 +19,4 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
-from .IPconvGUI import IPConverterFrame, SettingsFrame
+from .IPconvGUI import BatchFrame, IPConverterFrame, SettingsFrame
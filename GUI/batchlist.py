@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import wx
+from libIPconv.batch import AddressTable
+from libIPconv.globals import ADDRTYPE
+
+
+class BatchListCtrl(wx.ListCtrl):
+    """
+    Virtual report list showing an AddressTable. The control only asks for the rows it draws,
+    so each row is converted when it becomes visible and nothing is stored per row.
+    """
+    def __init__(self, *args, **kwds):
+        kwds["style"] = kwds.get("style", 0) | wx.LC_REPORT | wx.LC_VIRTUAL
+        wx.ListCtrl.__init__(self, *args, **kwds)
+        self.table = AddressTable()
+        # ADDRTYPE shown in each column
+        self.column_types = (ADDRTYPE.DOTTED, ADDRTYPE.HEX, ADDRTYPE.DEC)
+        self.reverse = False
+
+    def OnGetItemText(self, item, column):
+        return self.table.format_row(item, self.column_types[column], self.reverse)
+
+    def get_selected_rows(self) -> list:
+        selected_rows = []
+        row = self.GetFirstSelected()
+        while row != -1:
+            selected_rows.append(row)
+            row = self.GetNextSelected(row)
+        return selected_rows
+
+    def refresh_rows(self):
+        """Update the row count after the table changed and redraw the visible rows"""
+        self.SetItemCount(len(self.table))
+        self.Refresh()
@@ -28,7 +28,30 @@
 from wx.lib.embeddedimage import PyEmbeddedImage
 
 
-ExitIcon = PyEmbeddedImage(
+class CachedEmbeddedImage(PyEmbeddedImage):
+    """PyEmbeddedImage that decodes its data on first use only, instead of on every Get* call"""
+    def __init__(self, data, isBase64=True):
+        PyEmbeddedImage.__init__(self, data, isBase64)
+        self._cache = {}
+
+    def _get_cached(self, kind: str, getter):
+        result = self._cache.get(kind)
+        if result is None:
+            result = self._cache[kind] = getter(self)
+        return result
+
+    def GetBitmap(self):
+        return self._get_cached('bitmap', PyEmbeddedImage.GetBitmap)
+
+    def GetIcon(self):
+        return self._get_cached('icon', PyEmbeddedImage.GetIcon)
+
+    def GetImage(self):
+        # wx.Image is mutable, so callers get their own copy
+        return self._get_cached('image', PyEmbeddedImage.GetImage).Copy()
+
+
+ExitIcon = CachedEmbeddedImage(
     b'iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAACv0lEQVR4Xl1TbUjTaxQ//zmp'
     b'NivJyPeM2v4r1CxFifZBg8JiKCK9YCBkl/qgdEGNIZVBXDJ8wVX0QZdLSytT1kBEMD+ocLlg'
     b'1+VVMcNcvm3zPZWcMtZ2Os+D27oednbO+b1tYxt4q0d5SD2ijMb5hw+eutd/hMC2QrdbuqSr'
@@ -46,7 +69,7 @@ ExitIcon = PyEmbeddedImage(
     b'rkJggg==')
 
 
-IPconvIcon = PyEmbeddedImage(
+IPconvIcon = CachedEmbeddedImage(
     b'iVBORw0KGgoAAAANSUhEUgAAAQAAAAEACAYAAABccqhmAAAABHNCSVQICAgIfAhkiAAAIABJ'
     b'REFUeJztvXmUZMdZJ/qLyK326qre1JtaiyVLLVuS3bLUtizJWJbkZXi2OSNsvMm7/RjmGQMG'
     b'sxrw4fjMzGPO4R3mYYwNBg8wIAYDjxmwjQ0yGITwbuMNeZEsuSX1WktWrvF974+ILyLyVlZ1'
@@ -432,7 +455,7 @@ IPconvIcon = PyEmbeddedImage(
     b'6wAAAABJRU5ErkJggg==')
 
 
-IPconvPNG = PyEmbeddedImage(
+IPconvPNG = CachedEmbeddedImage(
     b'iVBORw0KGgoAAAANSUhEUgAAAIAAAACACAYAAADDPmHLAAAmN0lEQVR42u2dB3wcxbnAZ7Zc'
     b'P/VqWZJtyZbcOBeMbSBgjAnNjxrAQEzHlIDoCRBCEhJaCCEOyeMhCPBCKIYQHiV5AUIJjxYw'
     b'RoAxRrhItiwXWV0nXdud930zu6eTYuNbSSvdEb7fb3XS2dLNfPOfr83sLCXfyL+10LFuwDcy'
@@ -618,7 +641,7 @@ IPconvPNG = PyEmbeddedImage(
     b'AAAAAElFTkSuQmCC')
 
 
-SettingsIcon = PyEmbeddedImage(
+SettingsIcon = CachedEmbeddedImage(
     b'iVBORw0KGgoAAAANSUhEUgAAABAAAAAQCAYAAAAf8/9hAAAB0UlEQVR4Xo2RT0gbQRTG30Yb'
     b'w5o2Em20pB4MtlgItkUo9VRQs0eDJ4UepEUQWkquPfQgqCUlAfHWSwOiDUQLLb0UZgUV2+hB'
     b'UUhy6EWlf0gx0S60G9vGzXNmkhEsLtkHy/veN/v7eLMrQZVqebYYaGhqIGLW8pryY6JPFbPN'
@@ -19,25 +19,84 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
+import time
+startup_time = time.perf_counter()
+
+import argparse
+import sys
 import GUI
 import libIPconv as conv
 import wx
 
 
+# Seconds from the start of this script until the window is ready for input, checked by --startup-report
+STARTUP_BUDGET = 0.5
+
+
+class StartupReport(object):
+    """Records how long each startup phase takes and prints a breakdown compared to STARTUP_BUDGET"""
+    def __init__(self, start_time: float):
+        self.start_time = start_time
+        self.last_time = start_time
+        self.phases = []
+
+    def mark(self, phase_name: str):
+        """Record the time since the previous mark as phase_name"""
+        now = time.perf_counter()
+        self.phases.append((phase_name, now - self.last_time))
+        self.last_time = now
+
+    def print_report(self, output_file=sys.stderr):
+        total = self.last_time - self.start_time
+        for phase_name, seconds in self.phases:
+            print(f'{phase_name:<16}{seconds * 1000:8.1f} ms', file=output_file)
+        status = 'over budget' if (total > STARTUP_BUDGET) else 'within budget'
+        print(f'{"total":<16}{total * 1000:8.1f} ms ({status} of {STARTUP_BUDGET * 1000:.0f} ms)', file=output_file)
+
+
 class MainFrame(GUI.IPConverterFrame):
     def __init__(self, *args, **kwds):
         GUI.IPConverterFrame.__init__(self, *args, **kwds)
         self.last_changed = self.text_ctrl_hex
+        # Conversions while typing or pasting are throttled by this timer, see on_text
+        self.text_timer = None
+        self.text_pending = False
+        # Parse state of the dotted-quad value as of the last keystroke, see on_char
+        self.dotted_state = conv.filters.DOTTED_QUAD_START
+        self.dotted_state_value = ''
         self.text_ctrl_dec.addr_type = conv.ADDRTYPE.DEC
         self.text_ctrl_dotted.addr_type = conv.ADDRTYPE.DOTTED
         self.text_ctrl_hex.addr_type = conv.ADDRTYPE.HEX
 
-        main_converter.register_callback(self.text_ctrl_dec.ChangeValue, conv.ADDRTYPE.DEC)
-        main_converter.register_callback(self.text_ctrl_dotted.ChangeValue, conv.ADDRTYPE.DOTTED)
-        main_converter.register_callback(self.text_ctrl_hex.ChangeValue, conv.ADDRTYPE.HEX)
+        self.text_ctrls = {
+            conv.ADDRTYPE.DEC: self.text_ctrl_dec,
+            conv.ADDRTYPE.DOTTED: self.text_ctrl_dotted,
+            conv.ADDRTYPE.HEX: self.text_ctrl_hex
+        }
+        main_converter.register_batch_callback(self.apply_values)
+        # Long values are converted on a worker thread so the window stays responsive
+        self.busy = False
+        main_converter.enable_background(wx.CallAfter, busy_callback=self.show_busy)
 
         main_converter.reverse = self.checkbox_reverse.IsChecked()
 
+    def apply_values(self, values: dict):
+        """Update the text controls for all changed values with a single repaint"""
+        self.Freeze()
+        try:
+            for addr_type, value in values.items():
+                self.text_ctrls[addr_type].ChangeValue(value)
+        finally:
+            self.Thaw()
+
+    def show_busy(self, busy: bool):
+        """Show the busy cursor while a conversion runs in the background"""
+        if busy and not self.busy:
+            wx.BeginBusyCursor()
+        elif self.busy and not busy:
+            wx.EndBusyCursor()
+        self.busy = busy
+
     def monitor_clipboard(self):
         success, clipboard_content = super().monitor_clipboard()
         if success and clipboard_content:
@@ -49,7 +108,7 @@ class MainFrame(GUI.IPConverterFrame):
 
     def on_checkbox_reverse(self, event):
         main_converter.reverse = event.IsChecked()
-        main_converter.set_value(self.last_selected.GetValue(), self.last_selected.addr_type)
+        self.convert_control(self.last_selected)
 
     def on_char(self, event):
         super().on_char(event)
@@ -66,18 +125,21 @@ class MainFrame(GUI.IPConverterFrame):
                 control_content = event_control.GetValue()
                 control_selection = event_control.GetSelection()
 
-                # Insert the new character at the insertion point, over-writing any selected characters
-                first = control_content[0:control_selection[0]]
-                last = control_content[control_selection[1]:]
-                check_value = first + chr(event_key) + last
-
-                if event.GetSkipped():
-                    if '.' not in check_value:
-                        check_value += '.'
-                    if check_value.endswith('.'):
-                        check_value += '0'
-                    if not conv.isValidIPv4(check_value, conv.ADDRTYPE.DOTTED):
-                        event.Skip(False)
+                if (control_selection[0] == control_selection[1] == len(control_content)) and \
+                        (control_content == self.dotted_state_value):
+                    # Typing at the end, continue from the state of the current value
+                    state = conv.filters.feedDottedQuad(self.dotted_state, chr(event_key))
+                else:
+                    # Insert the new character at the insertion point, over-writing any selected characters
+                    first = control_content[0:control_selection[0]]
+                    last = control_content[control_selection[1]:]
+                    state = conv.filters.feedDottedQuad(conv.filters.DOTTED_QUAD_START, first + chr(event_key) + last)
+
+                if state is None:
+                    event.Skip(False)
+                elif control_selection[0] == control_selection[1] == len(control_content):
+                    self.dotted_state = state
+                    self.dotted_state_value = control_content + chr(event_key)
             else:
                 event.Skip()
 
@@ -102,20 +164,73 @@ class MainFrame(GUI.IPConverterFrame):
         event_object.SetInsertionPoint(len(first + filtered_string))
 
     def on_text(self, event):
-        event_object = event.GetEventObject()
-        main_converter.set_value(event_object.GetValue(), event_object.addr_type)
-        self.last_changed = event_object
+        """
+        Convert the changed value. While the typing delay timer is running, changes are only recorded
+        and the latest value is converted when it expires, so rapid input does not convert on every event.
+        """
+        self.last_changed = event.GetEventObject()
+        delay = self.get_setting('spin_ctrl_textdelay')
+        if delay <= 0:
+            self.convert_last_changed()
+        elif self.text_timer and self.text_timer.IsRunning():
+            self.text_pending = True
+        else:
+            self.convert_last_changed()
+            self.text_timer = wx.CallLater(delay, self.on_text_timer)
+
+    def on_text_timer(self):
+        """Convert the final value of any changes made while the typing delay timer was running"""
+        if self.text_pending:
+            self.convert_last_changed()
+            self.text_timer.Start(max(self.get_setting('spin_ctrl_textdelay'), 1))
+
+    def convert_control(self, text_ctrl):
+        """Convert the value of text_ctrl, blanking the other boxes and reporting values that are too long"""
+        try:
+            main_converter.set_value(text_ctrl.GetValue(), text_ctrl.addr_type)
+        except conv.InputTooLargeError as error:
+            self.apply_values({addr_type: '' for addr_type in self.text_ctrls if addr_type != text_ctrl.addr_type})
+            wx.LogError(str(error))
+
+    def convert_last_changed(self):
+        self.text_pending = False
+        self.convert_control(self.last_changed)
 
 
 class MainApp(wx.App):
+    def __init__(self, *args, startup_report=None, **kwargs):
+        self.startup_report = startup_report
+        wx.App.__init__(self, *args, **kwargs)
+
     def OnInit(self):
+        if self.startup_report:
+            self.startup_report.mark('wx.App')
         self.frame_main = MainFrame(None, wx.ID_ANY, "", name='MainFrame')
         self.SetTopWindow(self.frame_main)
+        if self.startup_report:
+            self.startup_report.mark('main window')
         self.frame_main.Show()
+        if self.startup_report:
+            self.startup_report.mark('show')
+            # Runs once pending events (including the first paint) are handled and the window takes input
+            wx.CallAfter(self.on_ready)
         return True
 
+    def on_ready(self):
+        self.startup_report.mark('ready')
+        self.startup_report.print_report()
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Quick IP Converter')
+    parser.add_argument(
+        '--startup-report', action='store_true', help='print how long each startup phase took to stderr'
+    )
+    args = parser.parse_args()
+    report = StartupReport(startup_time) if args.startup_report else None
+    if report:
+        report.mark('imports')
+
     main_converter = conv.Converter()
-    app = MainApp(0)
+    app = MainApp(0, startup_report=report)
     app.MainLoop()
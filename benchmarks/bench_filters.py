@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Compare the table-driven character filters against the previous implementations.
+Run from the repository root with: python -m benchmarks.bench_filters
+"""
+
+
+import random
+import string
+import timeit
+import libIPconv as conv
+
+
+def legacy_filterASCII(key_codes: list, addr_type: int) -> list:
+    if addr_type == conv.ADDRTYPE.DEC:
+        return [key for key in key_codes if key in conv.filters.dec_allowed_ascii]
+    elif addr_type == conv.ADDRTYPE.DOTTED:
+        return [key for key in key_codes if key in conv.filters.dotted_allowed_ascii]
+    return [key for key in key_codes if key in conv.filters.hex_allowed_ascii]
+
+
+def legacy_filterChars(chars: str, addr_type: int) -> str:
+    if addr_type == conv.ADDRTYPE.DEC:
+        return ''.join(ch for ch in chars if ch in string.digits)
+    elif addr_type == conv.ADDRTYPE.DOTTED:
+        return ''.join(ch for ch in chars if ch in string.digits or ch in '.')
+    return ''.join(ch for ch in chars if ch in string.hexdigits)
+
+
+def legacy_isAllowedASCII(key_code: int, addr_type: int) -> bool:
+    if addr_type == conv.ADDRTYPE.DEC:
+        return key_code in conv.filters.dec_allowed_ascii
+    elif addr_type == conv.ADDRTYPE.DOTTED:
+        return key_code in conv.filters.dotted_allowed_ascii
+    return key_code in conv.filters.hex_allowed_ascii
+
+
+def run(paste_size: int = 1 << 20, count: int = 10000, repeat: int = 5):
+    random.seed(0)
+    # A log excerpt sized paste, mostly text with some addresses in it
+    paste = ''.join(random.choice(string.ascii_letters + string.digits + ' .:-\n') for _ in range(paste_size))
+    paste_bytes = paste.encode('ascii')
+    key_codes = [[random.randrange(32, 127) for _ in range(16)] for _ in range(count)]
+    single_codes = [random.randrange(32, 127) for _ in range(count)]
+
+    for addr_type in (conv.ADDRTYPE.DEC, conv.ADDRTYPE.DOTTED, conv.ADDRTYPE.HEX):
+        cases = [
+            ('filterChars', lambda: legacy_filterChars(paste, addr_type),
+             lambda: conv.filters.filterChars(paste, addr_type), paste_size),
+            ('filterBytes', lambda: legacy_filterChars(paste_bytes.decode('ascii'), addr_type).encode('ascii'),
+             lambda: conv.filters.filterBytes(paste_bytes, addr_type), paste_size),
+            ('filterASCII', lambda: [legacy_filterASCII(codes, addr_type) for codes in key_codes],
+             lambda: [conv.filters.filterASCII(codes, addr_type) for codes in key_codes], count * 16),
+            ('isAllowedASCII', lambda: [legacy_isAllowedASCII(code, addr_type) for code in single_codes],
+             lambda: [conv.filters.isAllowedASCII(code, addr_type) for code in single_codes], count)
+        ]
+        for name, legacy_call, new_call, item_count in cases:
+            # Results must be identical before the timing is meaningful
+            if legacy_call() != new_call():
+                raise AssertionError(f'{name} mismatch for addr_type {addr_type.name}')
+
+            legacy_time = min(timeit.repeat(legacy_call, number=1, repeat=repeat))
+            new_time = min(timeit.repeat(new_call, number=1, repeat=repeat))
+            print(f'{name:<16} {addr_type.name:<7}  legacy {item_count / legacy_time:>14,.0f} items/s'
+                  f'  new {item_count / new_time:>14,.0f} items/s  speedup {legacy_time / new_time:.2f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Compare the table-driven dotted-quad kernels against the previous implementations.
+Run from the repository root with: python -m benchmarks.bench_kernels
+"""
+
+
+import random
+import timeit
+import libIPconv as conv
+
+
+def legacy_decToDottedQuadStr(input_value: int, reverse: bool = False) -> str:
+    if (input_value < 0) or (input_value > conv.V4MAXVAL):
+        raise ValueError(f'Input value is outside of IPv4 range: {input_value}')
+    byte_order = 'little' if reverse else 'big'
+    return '.'.join([str(octet) for octet in input_value.to_bytes(4, byte_order)])
+
+
+def legacy_dottedQuadStrToDecStr(input_value: str, reverse: bool = False) -> str:
+    split_value = [int(value) for value in input_value.split('.')]
+    byte_order = 'little' if reverse else 'big'
+    return str(int.from_bytes(split_value, byte_order))
+
+
+def legacy_dottedQuadStrToHexStr(input_value: str, reverse: bool = False) -> str:
+    split_value = [int(value) for value in input_value.split('.')]
+    if reverse:
+        split_value.reverse()
+    return bytes(split_value).hex()
+
+
+def run(count: int = 10000, repeat: int = 5):
+    random.seed(0)
+    int_values = [random.randint(0, conv.V4MAXVAL) for _ in range(count)]
+    dotted_values = [legacy_decToDottedQuadStr(value) for value in int_values]
+
+    cases = [
+        ('decToDottedQuadStr', legacy_decToDottedQuadStr, conv.decToDottedQuadStr, int_values),
+        ('dottedQuadStrToDecStr', legacy_dottedQuadStrToDecStr, conv.dottedQuadStrToDecStr, dotted_values),
+        ('dottedQuadStrToHexStr', legacy_dottedQuadStrToHexStr, conv.dottedQuadStrToHexStr, dotted_values)
+    ]
+
+    for name, legacy_function, new_function, values in cases:
+        for reverse in (False, True):
+            # Results must be identical before the timing is meaningful
+            for value in values:
+                if legacy_function(value, reverse) != new_function(value, reverse):
+                    raise AssertionError(f'{name} mismatch for {value!r} (reverse={reverse})')
+
+            legacy_time = min(timeit.repeat(
+                lambda: [legacy_function(value, reverse) for value in values], number=1, repeat=repeat))
+            new_time = min(timeit.repeat(
+                lambda: [new_function(value, reverse) for value in values], number=1, repeat=repeat))
+            print(f'{name:<24} reverse={reverse!s:<5}  legacy {count / legacy_time:>12,.0f} ops/s'
+                  f'  new {count / new_time:>12,.0f} ops/s  speedup {legacy_time / new_time:.2f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Import-time budget check for libIPconv.
+
+Run from the repository root:
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget 15 --runs 11
+
+Runs `python -X importtime -c "import libIPconv"` in fresh interpreters and compares the fastest cumulative
+import time of the package to the budget, since slower runs are mostly noise from the rest of the system.
+It also fails if any of the modules that libIPconv only imports on first use (re, string, decimal, threading,
+concurrent.futures) was imported. That part does not depend on machine speed.
+The exit status is 1 if either check fails.
+The package is byte-compiled first, so source compilation is not part of the measurement.
+"""
+
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+
+
+IMPORT_BUDGET_MS = 20.0
+
+# Modules that must not be imported by `import libIPconv` alone
+DEFERRED_MODULES = ('re', 'string', 'decimal', 'threading', 'concurrent.futures')
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module_name: str = 'libIPconv') -> tuple:
+    """
+    Import module_name in a fresh interpreter with -X importtime.
+    :return: tuple of the cumulative import time in ms and a dict of every imported module to its self time in ms
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+        cwd=REPOSITORY_ROOT, stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    cumulative_ms = None
+    self_times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or ('|' not in line):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # header line
+        name = name.strip()
+        self_times[name] = int(self_us) / 1000
+        if name == module_name:
+            cumulative_ms = int(cumulative_us) / 1000
+    if cumulative_ms is None:
+        raise RuntimeError(f'No import time found for {module_name}, was it already imported by site?')
+    return cumulative_ms, self_times
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.import_budget', description=__doc__.strip().split('\n')[0]
+    )
+    parser.add_argument('-b', '--budget', type=float, default=IMPORT_BUDGET_MS,
+                        help='allowed import time in ms (default: %(default)s)')
+    parser.add_argument('-r', '--runs', type=int, default=7,
+                        help='fresh interpreters to measure (default: %(default)s)')
+    parser.add_argument('-n', '--top', type=int, default=8, help='slowest modules to list (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    compileall.compile_dir(os.path.join(REPOSITORY_ROOT, 'libIPconv'), quiet=1)
+    measurements = [measure_import() for _ in range(args.runs)]
+    fastest_ms, self_times = min(measurements, key=lambda measurement: measurement[0])
+    median_ms = statistics.median(cumulative_ms for cumulative_ms, _ in measurements)
+
+    print(f'import libIPconv: fastest {fastest_ms:.1f} ms, median {median_ms:.1f} ms over {args.runs} runs '
+          f'(budget {args.budget:.1f} ms)')
+    for name, self_ms in sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f'    {name:<40} {self_ms:6.2f} ms')
+
+    failed = False
+    imported = [
+        name for name in DEFERRED_MODULES
+        if any(measurement[1].get(name) is not None for measurement in measurements)
+    ]
+    if imported:
+        print(f'FAIL: imported modules that should be deferred: {", ".join(imported)}', file=sys.stderr)
+        failed = True
+    if fastest_ms > args.budget:
+        print(f'FAIL: import time {fastest_ms:.1f} ms is over the budget of {args.budget:.1f} ms', file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
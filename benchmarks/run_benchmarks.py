@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Micro-benchmarks for the public conversion, validation and filter functions.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --threshold 0.15
+
+Each case calls one function over a fixed dataset. Timings are taken for batches of calls, giving
+ops/sec (from the median batch) and percentiles of the mean call time of each batch (batch-mean percentiles,
+not the latency of single calls). With --baseline the results are compared
+to a previous --output file and the exit status is 1 if any case is slower by more than the threshold.
+"""
+
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import libIPconv as conv
+
+
+BATCH_SIZE = 100  # calls per timed batch
+DATASET_SIZE = 1000
+COLUMN_SIZE = 10  # values per item of the *_columns datasets
+
+
+def build_datasets(size: int = DATASET_SIZE) -> dict:
+    """Build the fixed (seeded) datasets used by the benchmark cases"""
+    generator = random.Random(20190206)
+    int_values = [generator.randint(0, conv.V4MAXVAL) for _ in range(size)]
+    dotted = [conv.decToDottedQuadStr(value) for value in int_values]
+    datasets = {
+        'int': int_values,
+        'dec': [str(value) for value in int_values],
+        'dotted': dotted,
+        'hex': ['%08x' % value for value in int_values],
+        'hex_prefixed': ['0x%08X' % value for value in int_values],
+        'invalid': [
+            generator.choice(['256.1.1.1', '1..2.3', 'xyz', '0xg1', '99999999999', '1.2.3.4.5', '', '-1'])
+            for _ in range(size)
+        ],
+        'large_dec': [str(generator.getrandbits(512)) for _ in range(size // 10)],
+        'large_hex': ['%x' % generator.getrandbits(512) for _ in range(size // 10)],
+        'paste': [''.join(generator.choice('0123456789abcdefXYZ .:-\n') for _ in range(200)) for _ in range(size // 10)],
+        'key_codes': [[generator.randrange(32, 127) for _ in range(16)] for _ in range(size)],
+        'chars': [chr(generator.randrange(32, 127)) for _ in range(size)]
+    }
+    datasets['paste_bytes'] = [value.encode('ascii') for value in datasets['paste']]
+    for name in ('dec', 'dotted', 'hex'):
+        # lists of COLUMN_SIZE values for the functions that take many values per call
+        values = datasets[name]
+        datasets[f'{name}_columns'] = [values[start:start + COLUMN_SIZE] for start in range(0, size, COLUMN_SIZE)]
+    return datasets
+
+
+def build_cases(datasets: dict) -> list:
+    """Return a list of (name, function, dataset) tuples, the function takes one dataset item"""
+    ADDRTYPE = conv.ADDRTYPE
+    cases = []
+    conversions = [
+        ('dec', ADDRTYPE.DEC, ADDRTYPE.DOTTED), ('dec', ADDRTYPE.DEC, ADDRTYPE.HEX),
+        ('dotted', ADDRTYPE.DOTTED, ADDRTYPE.DEC), ('dotted', ADDRTYPE.DOTTED, ADDRTYPE.HEX),
+        ('hex', ADDRTYPE.HEX, ADDRTYPE.DEC), ('hex', ADDRTYPE.HEX, ADDRTYPE.DOTTED)
+    ]
+    for dataset, input_type, output_type in conversions:
+        for reverse in (False, True):
+            suffix = f'{input_type.name}->{output_type.name}{" reversed" if reverse else ""}'
+            cases.append((f'convertStrToType {suffix}', lambda value, i=input_type, o=output_type, r=reverse:
+                          conv.convertStrToType(value, i, o, r), dataset))
+            cases.append((f'get_converter {suffix}', conv.get_converter(input_type, output_type, reverse), dataset))
+            cases.append((f'convert_many {suffix} x{COLUMN_SIZE}',
+                          lambda values, i=input_type, o=output_type, r=reverse:
+                          list(conv.convert_many(values, i, o, r)), f'{dataset}_columns'))
+    cases.append(('convertStrToType invalid safe', lambda value:
+                  conv.convertStrToType(value, ADDRTYPE.DOTTED, ADDRTYPE.HEX, safe=True), 'invalid'))
+
+    for reverse in (False, True):
+        suffix = ' reversed' if reverse else ''
+        cases += [
+            (f'decStrToDottedQuadStr{suffix}', lambda value, r=reverse: conv.decStrToDottedQuadStr(value, r), 'dec'),
+            (f'decToDottedQuadList{suffix}', lambda value, r=reverse: conv.decToDottedQuadList(value, r), 'int'),
+            (f'decToDottedQuadStr{suffix}', lambda value, r=reverse: conv.decToDottedQuadStr(value, r), 'int'),
+            (f'decStrToHexStr{suffix}', lambda value, r=reverse: conv.decStrToHexStr(value, r), 'dec'),
+            (f'dottedQuadStrToDecStr{suffix}', lambda value, r=reverse: conv.dottedQuadStrToDecStr(value, r), 'dotted'),
+            (f'dottedQuadStrToHexStr{suffix}', lambda value, r=reverse: conv.dottedQuadStrToHexStr(value, r), 'dotted'),
+            (f'hexStrToDec{suffix}', lambda value, r=reverse: conv.hexStrToDec(value, r), 'hex'),
+            (f'hexStrToDecStr{suffix}', lambda value, r=reverse: conv.hexStrToDecStr(value, r), 'hex'),
+            (f'hexStrToDottedQuadStr{suffix}', lambda value, r=reverse: conv.hexStrToDottedQuadStr(value, r), 'hex')
+        ]
+    cases += [
+        ('decStrToHexStr large', conv.decStrToHexStr, 'large_dec'),
+        ('hexStrToDecStr large', conv.hexStrToDecStr, 'large_hex')
+    ]
+
+    for dataset in ('dotted', 'dec', 'hex', 'hex_prefixed', 'invalid'):
+        cases.append((f'isValidIPv4 {dataset}', conv.isValidIPv4, dataset))
+        cases.append((f'parseIPv4 {dataset}', conv.parseIPv4, dataset))
+    cases.append(('isValidIPv4 dotted strict', lambda value: conv.isValidIPv4(value, ADDRTYPE.DOTTED, True), 'dotted'))
+    cases.append(('isValidIPv4Mask dotted x10', lambda value: conv.isValidIPv4Mask([value] * 10), 'dotted'))
+
+    for addr_type in (ADDRTYPE.DEC, ADDRTYPE.DOTTED, ADDRTYPE.HEX):
+        name = addr_type.name
+        cases += [
+            (f'filters.filterASCII {name}', lambda value, t=addr_type: conv.filters.filterASCII(value, t), 'key_codes'),
+            (f'filters.filterChars {name}', lambda value, t=addr_type: conv.filters.filterChars(value, t), 'paste'),
+            (f'filters.filterBytes {name}', lambda value, t=addr_type: conv.filters.filterBytes(value, t), 'paste_bytes'),
+            (f'filters.isAllowedASCII {name}', lambda value, t=addr_type: conv.filters.isAllowedASCII(ord(value), t),
+             'chars'),
+            (f'filters.isAllowedChar {name}', lambda value, t=addr_type: conv.filters.isAllowedChar(value, t), 'chars')
+        ]
+
+    # Converter only converts the outputs that are read, so both are read after each set_value
+    output_types = (ADDRTYPE.DEC, ADDRTYPE.DOTTED)
+    converter = conv.Converter()
+    cases.append(('Converter.set_value hex',
+                  lambda value: set_and_get_values(converter, value, ADDRTYPE.HEX, output_types), 'hex'))
+    cached_converter = conv.Converter(cache=conv.ConversionCache())
+    cases.append(('Converter.set_value hex cached',
+                  lambda value: set_and_get_values(cached_converter, value, ADDRTYPE.HEX, output_types), 'hex'))
+    return cases
+
+
+def set_and_get_values(converter, value: str, addr_type: int, output_types: tuple) -> list:
+    converter.set_value(value, addr_type)
+    return [converter.get_value(output_type) for output_type in output_types]
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(function, items: list, rounds: int) -> dict:
+    """Time batches of calls over the dataset for the given number of rounds"""
+    batches = [items[start:start + BATCH_SIZE] for start in range(0, len(items), BATCH_SIZE)]
+    # mean time per call of each batch, single calls are too short to time on their own
+    per_call_ns = []
+    for batch in batches:
+        for item in batch:
+            function(item)  # warm up
+    for _ in range(rounds):
+        for batch in batches:
+            start = time.perf_counter_ns()
+            for item in batch:
+                function(item)
+            per_call_ns.append((time.perf_counter_ns() - start) / len(batch))
+    per_call_ns.sort()
+    median_ns = statistics.median(per_call_ns)
+    return {
+        'ops_per_sec': 1e9 / median_ns,
+        'batch_mean_p50_ns': percentile(per_call_ns, 0.50),
+        'batch_mean_p90_ns': percentile(per_call_ns, 0.90),
+        'batch_mean_p99_ns': percentile(per_call_ns, 0.99),
+        'calls': rounds * len(items)
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return a list of (name, baseline ops/sec, current ops/sec) for cases slower than the threshold allows"""
+    regressions = []
+    for name, result in results['cases'].items():
+        baseline_result = baseline.get('cases', {}).get(name)
+        if baseline_result and (result['ops_per_sec'] < baseline_result['ops_per_sec'] * (1 - threshold)):
+            regressions.append((name, baseline_result['ops_per_sec'], result['ops_per_sec']))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run_benchmarks', description=__doc__.strip().split('\n')[0])
+    parser.add_argument('-o', '--output', metavar='FILE', help='save the results as JSON')
+    parser.add_argument('-b', '--baseline', metavar='FILE', help='compare against results saved with --output')
+    parser.add_argument('-t', '--threshold', type=float, default=0.10,
+                        help='allowed fraction of ops/sec lost compared to the baseline (default: %(default)s)')
+    parser.add_argument('-r', '--rounds', type=int, default=20, help='rounds over each dataset (default: %(default)s)')
+    parser.add_argument('-k', '--filter', default='', help='only run cases whose name contains this text')
+    args = parser.parse_args(argv)
+
+    datasets = build_datasets()
+    results = {
+        'python': sys.version.split()[0], 'platform': platform.platform(), 'rounds': args.rounds, 'cases': {}
+    }
+    for name, function, dataset in build_cases(datasets):
+        if args.filter not in name:
+            continue
+        result = run_case(function, datasets[dataset], args.rounds)
+        results['cases'][name] = result
+        print(f'{name:<48} {result["ops_per_sec"]:>13,.0f} ops/s'
+              f'  batch-mean p50 {result["batch_mean_p50_ns"]:>9,.0f} ns  p90 {result["batch_mean_p90_ns"]:>9,.0f} ns  p99 {result["batch_mean_p99_ns"]:>9,.0f} ns')
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+        for name, baseline_ops, current_ops in regressions:
+            print(f'REGRESSION {name}: {baseline_ops:,.0f} -> {current_ops:,.0f} ops/s '
+                  f'({current_ops / baseline_ops - 1:+.1%})', file=sys.stderr)
+        if regressions:
+            return 1
+        print(f'No regressions beyond {args.threshold:.0%} compared to {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
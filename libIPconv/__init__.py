@@ -19,5 +19,21 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
-from . import filters
+import importlib
+from . import convregex as _convregex
 from .converter import *
+
+
+def __getattr__(name: str):
+    """
+    filters and ConversionCache are imported on first access and the compiled regexes (*_REC) are compiled
+    on first access, so `import libIPconv` stays cheap for callers that only need the conversion functions
+    """
+    if name == 'filters':
+        return importlib.import_module('.filters', __name__)
+    if name == 'ConversionCache':
+        from .cache import ConversionCache
+        return ConversionCache
+    if name in _convregex._COMPILED:
+        return getattr(_convregex, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
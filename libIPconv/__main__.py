@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Command-line interface for converting values without the GUI (and without importing wx).
+
+Examples:
+    python -m libIPconv -t dotted c0a80101 3232235777
+    python -m libIPconv -f hex -t dec --reverse < addresses.txt
+    python -m libIPconv -f hex -t dotted -i big.log -o converted.log --workers 8
+    python -m libIPconv -t dotted --annotate < server.log
+"""
+
+
+import argparse
+import sys
+from .conversions import get_converter, isValidIPv4, parseIPv4
+from .globals import ADDRTYPE, ADDRTYPE_NAMES
+
+# number of output lines collected before each write
+WRITE_BATCH_SIZE = 4096
+
+# number of characters read at a time in --annotate mode
+READ_SIZE = 256 * 1024
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m libIPconv',
+        description='Convert values between decimal, hexadecimal and dotted-quad IP formats. '
+                    'Values are read from the arguments, from --input files, or from stdin, one per line.'
+    )
+    parser.add_argument('values', nargs='*', help='values to convert (stdin is read when no values or files are given)')
+    parser.add_argument('-f', '--from', dest='input_type', choices=ADDRTYPE_NAMES, default=None,
+                        help='type of the input values (default: detect each value, which requires valid IPv4 values)')
+    parser.add_argument('-t', '--to', dest='output_type', choices=ADDRTYPE_NAMES, required=True,
+                        help='type to convert the values to')
+    parser.add_argument('-i', '--input', dest='input_files', action='append', default=[], metavar='FILE',
+                        help='file to read values from, one per line (can be repeated, - for stdin)')
+    parser.add_argument('-o', '--output', dest='output_file', default=None, metavar='FILE',
+                        help='file to write converted values to (default: stdout)')
+    parser.add_argument('-j', '--workers', type=int, default=None, metavar='N',
+                        help='convert a single --input file in N worker processes (requires --from and --output)')
+    parser.add_argument('--chunk-size', type=int, default=None, metavar='BYTES',
+                        help='approximate input bytes per worker chunk (default: 8 MiB)')
+    parser.add_argument('-a', '--annotate', action='store_true',
+                        help='find addresses anywhere in the input text and annotate them with the converted value '
+                             '(only the --from type is searched for if given)')
+    parser.add_argument('--replace', action='store_true',
+                        help='with --annotate, replace the addresses found instead of annotating them')
+    parser.add_argument('-r', '--reverse', action='store_true', help='reverse the byte order during conversion')
+    parser.add_argument('-s', '--strict', action='store_true',
+                        help='reject values that are not valid IPv4 addresses (dotted-quad values need four octets)')
+    return parser
+
+
+def build_converter(input_type: int, output_type: int, reverse: bool, strict: bool):
+    """Return a single-argument function converting a str value, raising ValueError on failure"""
+    if input_type is None:
+        def convert_detected(input_value: str) -> str:
+            detected_type = parseIPv4(input_value, ADDRTYPE.NONE, strict)[0]
+            if detected_type == ADDRTYPE.NONE:
+                raise ValueError(f'Not a valid IPv4 address: {input_value!r}')
+            if detected_type == output_type:
+                return input_value
+            return get_converter(detected_type, output_type, reverse)(input_value)
+        return convert_detected
+
+    conversion_function = get_converter(input_type, output_type, reverse)
+    if not strict:
+        return conversion_function
+
+    def convert_strict(input_value: str) -> str:
+        if not isValidIPv4(input_value, input_type, strict=True):
+            raise ValueError(f'Not a valid IPv4 address: {input_value!r}')
+        return conversion_function(input_value)
+    return convert_strict
+
+
+def iter_sources(values: list, input_files: list):
+    """Yield tuples of a source name and an iterable of str values"""
+    if values:
+        yield '<args>', values
+    for file_name in input_files:
+        if file_name == '-':
+            yield '<stdin>', (line.strip() for line in sys.stdin)
+        else:
+            with open(file_name, 'r', errors='replace') as input_file:
+                yield file_name, (line.strip() for line in input_file)
+    if not (values or input_files):
+        yield '<stdin>', (line.strip() for line in sys.stdin)
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    input_type = ADDRTYPE_NAMES[args.input_type] if args.input_type else None
+    output_type = ADDRTYPE_NAMES[args.output_type]
+    if input_type == output_type:
+        build_parser().error('--from and --to must be different types')
+
+    if args.workers is not None:
+        if (input_type is None) or (not args.output_file) or args.values or args.strict or \
+                args.annotate or args.replace or (len(args.input_files) != 1) or (args.input_files[0] == '-'):
+            build_parser().error('--workers requires --from, --output and exactly one --input file, '
+                                 'and can not be used with values, --strict, --annotate or --replace')
+        return run_parallel(args, input_type, output_type)
+
+    if args.annotate:
+        if args.values or args.strict:
+            build_parser().error('--annotate reads --input files or stdin and can not be used with values or --strict')
+        return run_annotate(args, input_type, output_type)
+    elif args.replace:
+        build_parser().error('--replace can only be used with --annotate')
+
+    conversion_function = build_converter(input_type, output_type, args.reverse, args.strict)
+    output = open(args.output_file, 'w') if args.output_file else sys.stdout
+    error_count = 0
+
+    for source_name, source_values in iter_sources(args.values, args.input_files):
+        batch = []
+        for line_number, input_value in enumerate(source_values, 1):
+            # Blank lines are passed through so output lines stay aligned with input lines
+            result = ''
+            if input_value:
+                try:
+                    result = conversion_function(input_value)
+                    # Invalid hex and decimal values convert to '' instead of raising
+                    if not result:
+                        raise ValueError(f'Invalid input value: {input_value!r}')
+                except ValueError as error:
+                    error_count += 1
+                    print(f'{source_name}:{line_number}: {error}', file=sys.stderr)
+            batch.append(result)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                batch.append('')
+                output.write('\n'.join(batch))
+                batch = []
+        if batch:
+            batch.append('')
+            output.write('\n'.join(batch))
+    if output is sys.stdout:
+        output.flush()
+    else:
+        output.close()
+
+    return 1 if error_count else 0
+
+
+def run_annotate(args: argparse.Namespace, input_type: int, output_type: int) -> int:
+    """Stream text from the input files or stdin, annotating or replacing the addresses found"""
+    from .scanner import ALL_ADDR_TYPES, ANNOTATE_TEMPLATE, annotate_stream
+
+    addr_types = ALL_ADDR_TYPES if (input_type is None) else {input_type}
+    template = '{converted}' if args.replace else ANNOTATE_TEMPLATE
+    output = open(args.output_file, 'w') if args.output_file else sys.stdout
+
+    for file_name in (args.input_files or ['-']):
+        input_file = sys.stdin if (file_name == '-') else open(file_name, 'r', errors='replace')
+        try:
+            chunks = iter(lambda: input_file.read(READ_SIZE), '')
+            for annotated in annotate_stream(chunks, output_type, addr_types, args.reverse, template):
+                output.write(annotated)
+        finally:
+            if input_file is not sys.stdin:
+                input_file.close()
+
+    if output is sys.stdout:
+        output.flush()
+    else:
+        output.close()
+    return 0
+
+
+def run_parallel(args: argparse.Namespace, input_type: int, output_type: int) -> int:
+    """Convert a single file with a process pool and report throughput on stderr"""
+    from . import parallel  # only needed for this mode, avoid the import cost otherwise
+
+    stats = parallel.convert_file(
+        args.input_files[0], args.output_file, input_type, output_type, reverse=args.reverse,
+        workers=args.workers, chunk_size=args.chunk_size or parallel.DEFAULT_CHUNK_SIZE
+    )
+    for pid, worker_stats in sorted(stats['workers'].items()):
+        print(f'worker {pid}: {worker_stats["chunks"]} chunks, {worker_stats["lines"]} lines, '
+              f'{worker_stats["lines_per_second"]:,.0f} lines/s, '
+              f'{worker_stats["bytes_per_second"] / 1048576:,.1f} MiB/s', file=sys.stderr)
+    print(f'total: {stats["lines"]} lines in {stats["seconds"]:.2f}s, {stats["lines_per_second"]:,.0f} lines/s, '
+          f'{stats["errors"]} errors', file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+
+"""
+A table of IPv4 addresses held as packed uint32 values, for views that show thousands of addresses.
+
+Rows are only formatted when they are asked for, so a virtual list control pays for the rows it draws
+and the table costs four bytes per address however many rows have been shown.
+Sorting and copying out work on the packed values, see packed for the record format used to copy.
+"""
+
+
+from array import array
+from .conversions import formatIPv4, parseIPv4
+from .globals import ADDRTYPE
+from .packed import UINT32_TYPECODE, format_packed, write_packed
+
+
+class AddressTable(object):
+    """Packed uint32 addresses with row formatting, sorting and text export"""
+    def __init__(self, int_values=()):
+        self.values = array(UINT32_TYPECODE, int_values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add_text(self, text: str, input_type: int = ADDRTYPE.NONE) -> int:
+        """
+        Parse whitespace-separated values from text and append the valid IPv4 addresses.
+        :param text: str with one or more values, such as a pasted column or the contents of a file
+        :param input_type: int value type from the ADDRTYPE enum, NONE detects the type of each value
+                           (values made of only decimal digits are read as decimal)
+        :return: int count of values that were skipped because they are not valid IPv4 addresses
+        """
+        values = self.values
+        skipped = 0
+        for input_value in text.split():
+            int_value = parseIPv4(input_value, input_type, strict=True)[1]
+            if int_value < 0:
+                skipped += 1
+            else:
+                values.append(int_value)
+        return skipped
+
+    def clear(self):
+        self.values = array(UINT32_TYPECODE)
+
+    def format_row(self, row: int, output_type: int, reverse: bool = False) -> str:
+        """
+        Format a single row as the given ADDRTYPE, matching the values from to_text().
+        :param row: int index of the row
+        :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
+        :param reverse: bool for whether or not to reverse the byte-order
+        """
+        return formatIPv4(self.values[row], output_type, reverse)
+
+    def sort(self, descending: bool = False, reverse: bool = False):
+        """
+        Sort the rows by value.
+        :param descending: bool for whether to put the largest value first
+        :param reverse: bool for whether to sort by the byte-reversed values, matching a reversed view
+        """
+        values = self.values
+        # array.byteswap() reverses each value, so the sort keys never become int objects held by the table
+        if reverse:
+            values.byteswap()
+        values = array(UINT32_TYPECODE, sorted(values, reverse=descending))
+        if reverse:
+            values.byteswap()
+        self.values = values
+
+    def to_text(self, output_type: int, rows=None, reverse: bool = False) -> str:
+        """
+        Format rows as text with one value per line.
+        Hex values have eight digits and no prefix, as in format_row().
+        :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
+        :param rows: optional iterable of int row indexes, all rows are used if it is None
+        :param reverse: bool for whether or not to reverse the byte-order
+        """
+        values = self.values if (rows is None) else map(self.values.__getitem__, rows)
+        # Records are written big-endian, so reading them back as little-endian reverses the byte-order
+        return '\n'.join(format_packed(write_packed(values), output_type, reverse))
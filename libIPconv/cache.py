@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+import threading
+from collections import OrderedDict
+from .conversions import InputTooLargeError, _convert
+
+
+class ConversionCache(object):
+    """
+    Bounded least-recently-used cache of conversion results.
+    Pass an instance as the cache argument of convertStrToType() or Converter to memoize conversions.
+    Failed conversions are cached too, so repeated invalid values are also cheap.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be at least 1, got {maxsize}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all entries and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def convert(self, input_val: str, input_type: int, output_type: int, reverse: bool = False,
+                safe: bool = False) -> str:
+        """Same as convertStrToType(), but the result is taken from or stored in the cache"""
+        key = (input_val, input_type, output_type, bool(reverse))
+        with self._lock:
+            try:
+                result = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                found = False
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                found = True
+
+        if not found:
+            try:
+                result = _convert(input_val, input_type, output_type, reverse)
+            except InputTooLargeError:
+                raise  # not stored, the check is cheap and the key would keep the oversized value alive
+            except ValueError as error:
+                result = _FailedConversion(str(error))
+            self._store(key, result)
+
+        if isinstance(result, _FailedConversion):
+            if safe:
+                return ''
+            # A new exception each time, since a shared one would be modified by every thread raising it
+            raise ValueError(result.message)
+        return result
+
+    def stats(self) -> dict:
+        """Return a dict with the hits, misses, evictions, current size and maxsize of the cache"""
+        return {
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+            'size': len(self._entries), 'maxsize': self.maxsize
+        }
+
+    def _store(self, key: tuple, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+class _FailedConversion(object):
+    """Cache entry for a conversion that raised ValueError, only the message is kept"""
+    __slots__ = ('message',)
+
+    def __init__(self, message: str):
+        self.message = message
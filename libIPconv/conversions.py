@@ -19,51 +19,76 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
+from . import convregex as _convregex
 from .convregex import *
 from .globals import *
 
 
-def convertStrToType(input_val: str, input_type: int, output_type: int, reverse: bool = False, safe: bool = False) -> str:
+class InputTooLargeError(ValueError):
+    """
+    Raised when a decimal or hex value has more digits than the limit set with set_max_digits().
+    Unlike other conversion errors this is raised even when safe=True, so the value is not silently dropped.
+    """
+
+
+def convertStrToType(input_val: str, input_type: int, output_type: int, reverse: bool = False, safe: bool = False,
+                     cache=None) -> str:
     """
     Be sure to use isValidIPv4() before this to sanity-check your input!
     :param input_val: str value to convert
     :param input_type: int value type from ADDRTYPE enum determining what the source type is
     :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
     :param reverse: bool for whether or not to reverse the byte-order
-    :return: str converted value or '' on error/failure
+    :param cache: optional ConversionCache to memoize results in
+    :return: str converted value or '' on error/failure (InputTooLargeError is always raised)
     """
-    return_value = ''
+    if _metrics is not None:
+        return _metrics.measure_conversion(input_val, input_type, output_type, reverse, safe, cache)
+    if cache is not None:
+        return cache.convert(input_val, input_type, output_type, reverse=reverse, safe=safe)
     try:
-        if input_type == output_type:
-            raise ValueError('output_type should be different than input_type')
-
-        if input_type == ADDRTYPE.DEC:
-            if output_type == ADDRTYPE.DOTTED:
-                return_value = decStrToDottedQuadStr(input_val, reverse)
-            elif output_type == ADDRTYPE.HEX:
-                return_value = decStrToHexStr(input_val, reverse)
-        elif input_type == ADDRTYPE.DOTTED:
-            if output_type == ADDRTYPE.DEC:
-                return_value = dottedQuadStrToDecStr(input_val, reverse)
-            elif output_type == ADDRTYPE.HEX:
-                return_value = dottedQuadStrToHexStr(input_val, reverse)
-        elif input_type == ADDRTYPE.HEX:
-            if output_type == ADDRTYPE.DEC:
-                return_value = hexStrToDecStr(input_val, reverse)
-            elif output_type == ADDRTYPE.DOTTED:
-                int_value = hexStrToDecStr(input_val, False)
-                return_value = decStrToDottedQuadStr(int_value, reverse)
+        return _convert(input_val, input_type, output_type, reverse)
+    except InputTooLargeError:
+        raise
     except ValueError:
         if not safe:
             raise
         else:
             return ''
-    else:
-        return return_value
+
+
+def convert_many(input_values, input_type: int, output_type: int, reverse: bool = False, on_error=None):
+    """
+    Lazily convert an iterable of str values. The conversion function is resolved once up-front,
+    so this is much cheaper than calling convertStrToType() for each value.
+    Errors never stop the stream. A failed value yields '' unless on_error is given.
+    A non-empty value that converts to '' (as invalid hex and decimal values do) is a failed value too.
+    :param input_values: iterable of str values to convert
+    :param input_type: int value type from ADDRTYPE enum determining what the source type is
+    :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
+    :param reverse: bool for whether or not to reverse the byte-order
+    :param on_error: optional function taking (index, input_value, exception), its return value is yielded instead
+    :return: generator of str converted values, one per input value
+    """
+    conversion_function = get_converter(input_type, output_type, reverse)
+    if (on_error is not None) and not callable(on_error):
+        raise ValueError('on_error is not callable')
+    return _convert_many(input_values, conversion_function, on_error)
+
+
+def _convert_many(input_values, conversion_function, on_error):
+    for index, input_value in enumerate(input_values):
+        try:
+            output_value = conversion_function(input_value)
+            if input_value and not output_value:
+                raise ValueError(f'Invalid input value: {input_value!r}')
+        except ValueError as error:
+            output_value = '' if (on_error is None) else on_error(index, input_value, error)
+        yield output_value
 
 
 def decStrToDottedQuadStr(input_value: str, reverse: bool = False) -> str:
-    if RECLIST[ADDRTYPE.DEC].fullmatch(input_value):
+    if _isDecStr(input_value):
         return decToDottedQuadStr(int(input_value), reverse)
     else:
         return ''
@@ -86,34 +111,84 @@ def decStrToHexStr(input_value: str, reverse: bool = False) -> str:
             byte_order = 'little'
         else:
             byte_order = 'big'
-        int_value = int(input_value)
+        _checkDigits(input_value)
+        int_value = _decStrToInt(input_value)
         return_value = int_value.to_bytes(((int_value.bit_length() + 7) // 8), byte_order).hex()
     return return_value
 
 
 def decToDottedQuadStr(input_value: int, reverse: bool = False) -> str:
-    return '.'.join([str(octet) for octet in decToDottedQuadList(input_value, reverse)])
+    if (input_value < 0) or (input_value > V4MAXVAL):
+        raise ValueError(f'Input value is outside of IPv4 range: {input_value}')
+    if reverse:
+        return (f'{OCTET_STRINGS[input_value & 255]}.{OCTET_STRINGS[(input_value >> 8) & 255]}.'
+                f'{OCTET_STRINGS[(input_value >> 16) & 255]}.{OCTET_STRINGS[input_value >> 24]}')
+    return (f'{OCTET_STRINGS[input_value >> 24]}.{OCTET_STRINGS[(input_value >> 16) & 255]}.'
+            f'{OCTET_STRINGS[(input_value >> 8) & 255]}.{OCTET_STRINGS[input_value & 255]}')
 
 
 def dottedQuadStrToDecStr(input_value: str, reverse: bool = False) -> str:
-    split_value = [int(value) for value in input_value.split('.')]
-    if reverse:
-        byte_order = 'little'
-    else:
-        byte_order = 'big'
-    return str(int.from_bytes(split_value, byte_order))
+    return str(_parseDottedQuad(input_value, reverse)[0])
 
 
 def dottedQuadStrToHexStr(input_value: str, reverse: bool = False) -> str:
-    split_value = [int(value) for value in input_value.split('.')]
+    octets = input_value.split('.')
     if reverse:
-        split_value.reverse()
-    byte_value = bytes(split_value)
-    return byte_value.hex()
+        octets.reverse()
+    try:
+        return ''.join([OCTET_HEX_PAIRS[octet] for octet in octets])
+    except KeyError:
+        # Not in canonical form (e.g. leading zeroes), let the parser handle or reject it
+        return _formatHex(*_parseDottedQuad(input_value, reverse))
+
+
+def formatIPv4(int_value: int, output_type: int, reverse: bool = False, hex_prefix: str = '') -> str:
+    """
+    Format an int IPv4 address value as the given ADDRTYPE, the counterpart of parseIPv4().
+    Hex values are formatted with eight digits after hex_prefix (e.g. '0x').
+    :param int_value: int value in the IPv4 range
+    :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
+    :param reverse: bool for whether or not to reverse the byte-order
+    :param hex_prefix: str put in front of hex values
+    """
+    if output_type == ADDRTYPE.DOTTED:
+        return decToDottedQuadStr(int_value, reverse)
+    if reverse:
+        int_value = _byteSwap(int_value, 4)
+    if output_type == ADDRTYPE.HEX:
+        return f'{hex_prefix}{int_value:08x}'
+    elif output_type == ADDRTYPE.DEC:
+        return str(int_value)
+    else:
+        raise ValueError(f'output_type of {output_type} is not valid')
+
+
+def get_converter(input_type: int, output_type: int, reverse: bool = False):
+    """
+    Plan a conversion once and return a specialized single-argument function for it.
+    The function parses its str argument to an int and formats the result directly, so it skips
+    the intermediate strings and dispatch of convertStrToType() while returning the same values.
+    Like convertStrToType() with safe=False, it raises ValueError for values it cannot convert.
+    :param input_type: int value type from ADDRTYPE enum determining what the source type is
+    :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
+    :param reverse: bool for whether or not to reverse the byte-order
+    :return: function taking a str value and returning the converted str value
+    """
+    if input_type == output_type:
+        raise ValueError('output_type should be different than input_type')
+    conversion_function = _CONVERTERS.get((input_type, output_type, bool(reverse)))
+    if conversion_function is None:
+        raise ValueError(f'Conversion from {input_type} to {output_type} is not supported')
+    return conversion_function
+
+
+def get_max_digits() -> int:
+    """Return the maximum number of characters accepted for decimal-hex conversion, 0 means no limit"""
+    return _max_digits
 
 
 def hexStrToDec(input_value: str, reverse: bool = False) -> int:
-    if RECLIST[ADDRTYPE.HEX].fullmatch(input_value):
+    if _isHexStr(input_value):
         trimmed = input_value.lstrip('0xX')
         if len(trimmed) % 2:
             trimmed = '0' + trimmed
@@ -128,8 +203,13 @@ def hexStrToDec(input_value: str, reverse: bool = False) -> int:
 
 
 def hexStrToDecStr(hex_addr: str, reverse: bool = False) -> str:
+    _checkDigits(hex_addr)
     check_value = hexStrToDec(hex_addr, reverse)
-    return '' if (check_value == -1) else str(check_value)
+    return '' if (check_value == -1) else _intToDecStr(check_value)
+
+
+def hexStrToDottedQuadStr(input_value: str, reverse: bool = False) -> str:
+    return decStrToDottedQuadStr(hexStrToDecStr(input_value, False), reverse)
 
 
 def isValidIPv4(input_value, addr_type: int = ADDRTYPE.NONE, strict: bool = False) -> bool:
@@ -139,22 +219,10 @@ def isValidIPv4(input_value, addr_type: int = ADDRTYPE.NONE, strict: bool = Fals
     The string can be a dotted-quad format, hex format, or decimal format. (no leading or trailing whitespace)
     strict mode will require dotted-quad format to include four valid octets
     """
-    check_value = -1
-
     if isinstance(input_value, str):
-        if '.' in input_value and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.DOTTED]):
-            # Confirm match for dotted-quad format
-            if len(input_value) <= 15 and IP_RECLIST[ADDRTYPE.DOTTED].fullmatch(input_value):
-                if strict and not DOTTEDQUADIP_STRICTREC.fullmatch(input_value):
-                    check_value = -2
-                else:
-                    check_value = 0
-            else:
-                check_value = -3
-        elif IP_RECLIST[ADDRTYPE.DEC].fullmatch(input_value) and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.DEC]):
-            check_value = int(input_value)
-        elif IP_RECLIST[ADDRTYPE.HEX].fullmatch(input_value) and (addr_type in [ADDRTYPE.NONE, ADDRTYPE.HEX]):
-            check_value = int(input_value, 16)
+        if _metrics is not None:
+            return _metrics.record_validation(addr_type, parseIPv4(input_value, addr_type, strict)[1] >= 0)
+        return parseIPv4(input_value, addr_type, strict)[1] >= 0
     elif isinstance(input_value, int):
         if addr_type in [ADDRTYPE.NONE, ADDRTYPE.DEC]:
             check_value = input_value
@@ -164,3 +232,290 @@ def isValidIPv4(input_value, addr_type: int = ADDRTYPE.NONE, strict: bool = Fals
         raise ValueError(f'Expected input type str or int. Got {type(input_value)}')
 
     return (check_value >= 0) and (check_value <= V4MAXVAL)
+
+
+def isValidIPv4Mask(input_values, addr_type: int = ADDRTYPE.NONE, strict: bool = False) -> list:
+    """
+    Bulk form of isValidIPv4() for a list, array or other iterable of values.
+    :return: list of bool, True for each value that is a valid IPv4 address
+    """
+    return [
+        (parseIPv4(value, addr_type, strict)[1] >= 0) if isinstance(value, str)
+        else isValidIPv4(value, addr_type, strict) for value in input_values
+    ]
+
+
+def parseIPv4(input_value: str, addr_type: int = ADDRTYPE.NONE, strict: bool = False) -> tuple:
+    """
+    Validate, classify and parse a str value in a single pass without regular expressions.
+    Accepts exactly the values isValidIPv4() accepts, with the same addr_type and strict handling.
+    For dotted-quad values the int has one byte per octet given, so '10.1' parses to 2561.
+    :return: tuple of the detected ADDRTYPE and the int value, or (ADDRTYPE.NONE, -1) if it is not valid
+    """
+    if '.' in input_value:
+        if (addr_type not in _DOTTED_ADDR_TYPES) or (len(input_value) > 15):
+            return _INVALID_IPV4
+        octets = input_value.split('.')
+        if (len(octets) > 4) or (strict and (len(octets) != 4)):
+            return _INVALID_IPV4
+        int_value = 0
+        for octet in octets:
+            octet_value = OCTET_VALUES.get(octet)
+            if octet_value is None:
+                # Leading zeroes are allowed as long as there are no more than three digits
+                if not ((0 < len(octet) <= 3) and octet.isascii() and octet.isdigit()):
+                    return _INVALID_IPV4
+                octet_value = int(octet)
+                if octet_value > 255:
+                    return _INVALID_IPV4
+            int_value = (int_value << 8) | octet_value
+        return ADDRTYPE.DOTTED, int_value
+
+    if (addr_type in _DEC_ADDR_TYPES) and (len(input_value) <= 10) and input_value.isascii() and input_value.isdigit():
+        int_value = int(input_value)
+        return (ADDRTYPE.DEC, int_value) if (int_value <= V4MAXVAL) else _INVALID_IPV4
+
+    if addr_type in _HEX_ADDR_TYPES:
+        digits = input_value[2:] if input_value[:2] in ('0x', '0X') else input_value
+        # strip() removes every hex digit, so anything left over is an invalid character
+        if (0 < len(digits) <= 8) and not digits.strip(_HEX_DIGIT_CHARS):
+            return ADDRTYPE.HEX, int(digits, 16)
+
+    return _INVALID_IPV4
+
+
+# Characters allowed in hex values, addr_type values accepted for each format and the result for invalid values
+_HEX_DIGIT_CHARS = '0123456789abcdefABCDEF'
+_DEC_ADDR_TYPES = frozenset([ADDRTYPE.NONE, ADDRTYPE.DEC])
+_DOTTED_ADDR_TYPES = frozenset([ADDRTYPE.NONE, ADDRTYPE.DOTTED])
+_HEX_ADDR_TYPES = frozenset([ADDRTYPE.NONE, ADDRTYPE.HEX])
+_INVALID_IPV4 = (ADDRTYPE.NONE, -1)
+
+
+def __getattr__(name: str):
+    """The compiled regexes star-imported from convregex are compiled there on first access"""
+    if name in _convregex._COMPILED:
+        return getattr(_convregex, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+# MetricsRegistry receiving measurements, set by metrics.enable() (None means metrics are disabled)
+_metrics = None
+
+# Maximum characters for decimal-hex conversion, see set_max_digits()
+_max_digits = 1000000
+
+# Sizes below which int() and str() are used directly. Larger decimal values are split in halves recursively,
+# since int() and str() are quadratic in the number of digits and refuse over 4300 digits on Python 3.11+
+_DEC_SPLIT_DIGITS = 2048
+_DEC_SPLIT_BITS = 1024
+
+
+def set_max_digits(max_digits: int):
+    """
+    Set the maximum number of characters accepted for decimal-hex conversion.
+    Longer values raise InputTooLargeError. Conversion time grows faster than linearly,
+    so this bounds how long a single conversion can take.
+    :param max_digits: int number of characters, 0 for no limit
+    """
+    global _max_digits
+    if max_digits < 0:
+        raise ValueError(f'max_digits must be 0 or more, got {max_digits}')
+    _max_digits = max_digits
+
+
+def _byteSwap(input_value: int, byte_count: int) -> int:
+    return int.from_bytes(input_value.to_bytes(byte_count, 'big'), 'little')
+
+
+def _checkDigits(input_value: str):
+    if _max_digits and (len(input_value) > _max_digits):
+        raise InputTooLargeError(
+            f'Value has {len(input_value)} characters, more than the limit of {_max_digits} (see set_max_digits())'
+        )
+
+
+def _convert(input_val: str, input_type: int, output_type: int, reverse: bool) -> str:
+    """Core of convertStrToType() without the cache, metrics and safe handling, raises ValueError on failure"""
+    if input_type == output_type:
+        raise ValueError('output_type should be different than input_type')
+    conversion_function = _CONVERTERS.get((input_type, output_type, bool(reverse)))
+    return conversion_function(input_val) if conversion_function else ''
+
+
+def _decStrToInt(input_value: str) -> int:
+    """Same as int() for a decimal str, but subquadratic for long values"""
+    if (len(input_value) <= _DEC_SPLIT_DIGITS) or not (input_value.isascii() and input_value.isdigit()):
+        return int(input_value)
+    powers = {}
+
+    def power_of_ten(exponent: int) -> int:
+        result = powers.get(exponent)
+        if result is None:
+            if exponent <= _DEC_SPLIT_DIGITS:
+                result = 10 ** exponent
+            else:
+                half = power_of_ten(exponent >> 1)
+                result = half * half * (10 if (exponent & 1) else 1)
+            powers[exponent] = result
+        return result
+
+    def parse(start: int, end: int) -> int:
+        if (end - start) <= _DEC_SPLIT_DIGITS:
+            return int(input_value[start:end])
+        middle = (start + end + 1) >> 1
+        return (parse(start, middle) * power_of_ten(end - middle)) + parse(middle, end)
+
+    return parse(0, len(input_value))
+
+
+def _formatHex(input_value: int, byte_count: int) -> str:
+    """Format as hex with two digits per byte, or '' when there are no bytes (matches bytes.hex())"""
+    return '%0*x' % (byte_count * 2, input_value) if byte_count else ''
+
+
+def _intToDecStr(input_value: int) -> str:
+    """
+    Same as str() for a non-negative int, but subquadratic for large values.
+    The value is rebuilt as a Decimal from its binary halves, which is fast because decimal
+    multiplies large numbers with a number-theoretic transform, and a Decimal converts to str in linear time.
+    """
+    if input_value.bit_length() <= (_DEC_SPLIT_BITS * 4):
+        return str(input_value)
+    import decimal
+    powers = {}
+
+    def power_of_two(exponent: int) -> decimal.Decimal:
+        result = powers.get(exponent)
+        if result is None:
+            if exponent <= _DEC_SPLIT_BITS:
+                result = decimal.Decimal(1 << exponent)
+            else:
+                result = power_of_two(exponent >> 1) * power_of_two(exponent - (exponent >> 1))
+            powers[exponent] = result
+        return result
+
+    def build(int_value: int, bit_count: int) -> decimal.Decimal:
+        if bit_count <= _DEC_SPLIT_BITS:
+            return decimal.Decimal(int_value)
+        half = bit_count >> 1
+        high = int_value >> half
+        return build(int_value - (high << half), half) + (build(high, bit_count - half) * power_of_two(half))
+
+    with decimal.localcontext() as context:
+        context.prec = decimal.MAX_PREC
+        context.Emax = decimal.MAX_EMAX
+        context.Emin = decimal.MIN_EMIN
+        context.traps[decimal.Inexact] = True
+        return str(build(input_value, input_value.bit_length()))
+
+
+def _isDecStr(input_value: str) -> bool:
+    """Same result as RECLIST[ADDRTYPE.DEC].fullmatch(), without the regex"""
+    return input_value.isascii() and input_value.isdigit()
+
+
+def _isHexStr(input_value: str) -> bool:
+    """Same result as RECLIST[ADDRTYPE.HEX].fullmatch(), without the regex"""
+    digits = input_value[2:] if input_value[:2] in ('0x', '0X') else input_value
+    # strip() removes every hex digit, so anything left over is an invalid character
+    return bool(digits) and not digits.strip(_HEX_DIGIT_CHARS)
+
+
+def _parseDec(input_value: str) -> int:
+    """Parse a decimal str to int, returning -1 if it is not a plain decimal value"""
+    return int(input_value) if _isDecStr(input_value) else -1
+
+
+def _parseDottedQuad(input_value: str, reverse: bool) -> tuple:
+    """Parse a dotted-quad str (one to four octets) to int, returning a tuple of the value and the octet count"""
+    octets = input_value.split('.')
+    int_value = 0
+    for octet in (reversed(octets) if reverse else octets):
+        octet_value = OCTET_VALUES.get(octet)
+        if octet_value is None:
+            # Not in canonical form, fall back to int() for leading zeroes and the like
+            octet_value = int(octet)
+            if (octet_value < 0) or (octet_value > 255):
+                raise ValueError(f'Octet value is outside of range 0-255: {octet}')
+        int_value = (int_value << 8) | octet_value
+    return int_value, len(octets)
+
+
+def _parseHex(input_value: str) -> tuple:
+    """
+    Parse a hex str to int, returning a tuple of the value and the byte count or (-1, 0) if it is not a hex value.
+    The byte count is based on the digits after the prefix and leading zeroes are removed, as in hexStrToDec().
+    """
+    if not _isHexStr(input_value):
+        return -1, 0
+    trimmed = input_value.lstrip('0xX')
+    return (int(trimmed, 16) if trimmed else 0), ((len(trimmed) + 1) // 2)
+
+
+def _planDecToDottedQuad(reverse: bool):
+    def dec_to_dotted(input_value: str) -> str:
+        int_value = _parseDec(input_value)
+        return '' if (int_value == -1) else decToDottedQuadStr(int_value, reverse)
+    return dec_to_dotted
+
+
+def _planDecToHex(reverse: bool):
+    def dec_to_hex(input_value: str) -> str:
+        if not input_value:
+            return ''
+        _checkDigits(input_value)
+        int_value = _decStrToInt(input_value)
+        if int_value < 0:
+            raise ValueError(f'Negative values can not be converted: {input_value}')
+        byte_count = (int_value.bit_length() + 7) // 8
+        if reverse:
+            return int_value.to_bytes(byte_count, 'little').hex()
+        return _formatHex(int_value, byte_count)
+    return dec_to_hex
+
+
+def _planDottedQuadToDec(reverse: bool):
+    def dotted_to_dec(input_value: str) -> str:
+        return str(_parseDottedQuad(input_value, reverse)[0])
+    return dotted_to_dec
+
+
+def _planDottedQuadToHex(reverse: bool):
+    def dotted_to_hex(input_value: str) -> str:
+        return dottedQuadStrToHexStr(input_value, reverse)
+    return dotted_to_hex
+
+
+def _planHexToDec(reverse: bool):
+    def hex_to_dec(input_value: str) -> str:
+        _checkDigits(input_value)
+        int_value, byte_count = _parseHex(input_value)
+        if int_value == -1:
+            return ''
+        return _intToDecStr(_byteSwap(int_value, byte_count) if reverse else int_value)
+    return hex_to_dec
+
+
+def _planHexToDottedQuad(reverse: bool):
+    def hex_to_dotted(input_value: str) -> str:
+        int_value = _parseHex(input_value)[0]
+        return '' if (int_value == -1) else decToDottedQuadStr(int_value, reverse)
+    return hex_to_dotted
+
+
+# Conversion plans for each supported (input_type, output_type) pair
+_PLANS = {
+    (ADDRTYPE.DEC, ADDRTYPE.DOTTED): _planDecToDottedQuad,
+    (ADDRTYPE.DEC, ADDRTYPE.HEX): _planDecToHex,
+    (ADDRTYPE.DOTTED, ADDRTYPE.DEC): _planDottedQuadToDec,
+    (ADDRTYPE.DOTTED, ADDRTYPE.HEX): _planDottedQuadToHex,
+    (ADDRTYPE.HEX, ADDRTYPE.DEC): _planHexToDec,
+    (ADDRTYPE.HEX, ADDRTYPE.DOTTED): _planHexToDottedQuad
+}
+
+# Specialized conversion functions for each (input_type, output_type, reverse) combination
+_CONVERTERS = {
+    (input_type, output_type, reverse): plan(reverse)
+    for (input_type, output_type), plan in _PLANS.items() for reverse in (False, True)
+}
@@ -19,17 +19,97 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
+from . import conversions as _conversions
 from .conversions import *
 
 
+# Values at least this long are converted on the worker thread when background mode is enabled
+BACKGROUND_MIN_LENGTH = 4096
+
+
 class Converter(object):
     _supported_addr_types = [ADDRTYPE.DEC, ADDRTYPE.DOTTED, ADDRTYPE.HEX]
 
-    def __init__(self, safe=True):
+    def __init__(self, safe=True, cache=None):
+        """
+        :param safe: bool for whether conversion errors result in '' values instead of raising ValueError
+        :param cache: optional ConversionCache to memoize conversions in
+        """
         self.reverse = False
         self.safe = safe
+        self.cache = cache
         self._callbacks = {key: None for key in self._supported_addr_types}
+        self._batch_callback = None
         self._values = {key: '' for key in self._supported_addr_types}
+        # Outputs are converted on demand from the last set value, these track what still needs converting
+        self._input_type = ADDRTYPE.NONE
+        self._input_reverse = False
+        self._pending_types = set()
+        # (value, addr_type, reverse) of the last set_value, used to skip repeats of the same input
+        self._last_input = None
+        self._change_token = 0
+        # Background mode, see enable_background()
+        self._dispatch = None
+        self._busy_callback = None
+        self._background_min_length = BACKGROUND_MIN_LENGTH
+        self._executor = None
+        self._background_future = None
+        self._background_token = None
+
+    @property
+    def change_token(self) -> int:
+        """Token that changes whenever the stored values change, for cheap comparison with has_changed()"""
+        return self._change_token
+
+    def has_changed(self, token: int) -> bool:
+        """Return whether the stored values changed since token was obtained from change_token"""
+        return token != self._change_token
+
+    def disable_background(self):
+        """Go back to converting every value in set_value, dropping any result still being converted"""
+        self._cancel_background()
+        self._dispatch = None
+        self._busy_callback = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def enable_background(self, dispatch, busy_callback=None, min_length: int = BACKGROUND_MIN_LENGTH):
+        """
+        Convert long values on a worker thread so set_value returns right away.
+        Results are handed back through dispatch, and callbacks run when it calls them.
+        Results for values that were replaced by a newer set_value before they finished are dropped.
+        :param dispatch: function taking (function, *args) that calls it on the thread owning this Converter,
+                         e.g. wx.CallAfter
+        :param busy_callback: optional function taking a bool, called with True when a background conversion
+                              starts and False when it is done or dropped
+        :param min_length: int length at which values are converted in the background
+        :return: None
+        """
+        if not callable(dispatch):
+            raise ValueError('dispatch is not callable')
+        if (busy_callback is not None) and not callable(busy_callback):
+            raise ValueError('busy_callback is not callable')
+        self._dispatch = dispatch
+        self._busy_callback = busy_callback
+        self._background_min_length = min_length
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='Converter')
+
+    def get_value(self, addr_type: int) -> str:
+        """
+        Return the current value for addr_type, converting the last set value on first access.
+        The result is kept until the next set_value.
+        """
+        self._check_addr_type(addr_type)
+        if addr_type in self._pending_types:
+            self._values[addr_type] = convertStrToType(
+                self._values[self._input_type], self._input_type, addr_type, reverse=self._input_reverse,
+                safe=self.safe, cache=self.cache
+            )
+            self._pending_types.discard(addr_type)
+        return self._values[addr_type]
 
     def is_addr_type_supported(self, addr_type: int) -> bool:
         return addr_type in self._supported_addr_types
@@ -49,36 +129,149 @@ class Converter(object):
 
         self._callbacks[addr_type] = callback_function
 
+    def register_batch_callback(self, callback_function):
+        """
+        Allows calling a single function once per set_value with all of the values changed as a result.
+        This is called after any per-type callbacks, so a GUI can apply every update at once.
+        :param callback_function: function that takes a single argument (dict of ADDRTYPE to new str value), or None
+        :return: None
+        """
+        if (callback_function is not None) and not callable(callback_function):
+            raise ValueError('callback_function is not callable')
+
+        self._batch_callback = callback_function
+
     def reset_values(self):
         for key in self._values.keys():
             self._values[key] = ''
+        self._pending_types.clear()
+        self._last_input = None
+        self._change_token += 1
 
     def run_callbacks(self, addr_type: int):
         """Run callback functions for types other than the input addr_type"""
         for typeval in self._supported_addr_types:
             if (typeval != addr_type) and self._callbacks[typeval]:
-                self._callbacks[typeval](self._values[typeval])
+                self._callbacks[typeval](self.get_value(typeval))
+        if self._batch_callback:
+            self._batch_callback(
+                {typeval: self.get_value(typeval) for typeval in self._supported_addr_types if typeval != addr_type}
+            )
 
     def run_conversions(self, addr_type: int):
-        """Convert the currently stored value of addr_type to other types"""
+        """
+        Convert the currently stored value of addr_type to the other types that have a callback registered.
+        All of them are converted when a batch callback is registered.
+        Other types are converted later if get_value() is called for them.
+        """
         self._check_addr_type(addr_type)
+        self._input_type = addr_type
+        self._input_reverse = self.reverse
+        self._pending_types = {typeval for typeval in self._supported_addr_types if typeval != addr_type}
         for typeval in self._supported_addr_types:
-            if typeval != addr_type:
-                self._values[typeval] = convertStrToType(
-                    self._values[addr_type], addr_type, typeval, reverse=self.reverse, safe=self.safe)
+            if (typeval != addr_type) and (self._batch_callback or self._callbacks[typeval]):
+                self.get_value(typeval)
+
+    def set_value(self, value: str, addr_type: int) -> bool:
+        """
+        Store value for addr_type, convert it to the other types and call their callbacks.
+        Setting the same value, addr_type and reverse setting as the last call does nothing.
+        :param value: str value to set
+        :param addr_type: int from the ADDRTYPE enum
+        :return: bool for whether the values changed
+        """
+        metrics = _conversions._metrics
+        if metrics is None:
+            return self._set_value(value, addr_type)
+        start_time = metrics.clock()
+        changed = self._set_value(value, addr_type)
+        metrics.record_set_value(addr_type, metrics.clock() - start_time)
+        return changed
 
-    def set_value(self, value: str, addr_type: int):
+    def _cancel_background(self):
+        """Drop any pending background conversion, its result is ignored if it is already running"""
+        if self._background_token is None:
+            return
+        self._background_future.cancel()
+        self._background_future = None
+        self._background_token = None
+        if self._busy_callback:
+            self._busy_callback(False)
+
+    def _finish_background(self, token: int, addr_type: int, results: dict, error):
+        """Called through dispatch with the worker results, which are only applied if no newer value was set"""
+        if token != self._background_token:
+            return
+        self._background_future = None
+        self._background_token = None
+        if self._busy_callback:
+            self._busy_callback(False)
+        if error is not None:
+            raise error
+        self._values.update(results)
+        self.run_callbacks(addr_type)
+
+    def _run_background(self, token: int, value: str, addr_type: int, reverse: bool):
+        """Worker thread part of a background conversion"""
+        results = {}
+        error = None
+        try:
+            for typeval in self._supported_addr_types:
+                if typeval != addr_type:
+                    results[typeval] = convertStrToType(
+                        value, addr_type, typeval, reverse=reverse, safe=self.safe, cache=self.cache
+                    )
+        except ValueError as conversion_error:
+            error = conversion_error
+        self._dispatch(self._finish_background, token, addr_type, results, error)
+
+    def _set_value(self, value: str, addr_type: int) -> bool:
+        """set_value() without the metrics"""
         self._check_addr_type(addr_type)
 
+        input_key = (value, addr_type, self.reverse)
+        if input_key == self._last_input:
+            return False
+        # Cleared until the new value is applied, so a value that raises (InputTooLargeError) is not seen as a repeat
+        # and setting the previous value again converts it again
+        self._last_input = None
+
         self._values[addr_type] = value
+        self._cancel_background()
+
+        if self._dispatch and (len(value) >= self._background_min_length):
+            self._start_background(value, addr_type)
+            self._last_input = input_key
+            return True
 
         if not value:
             self.reset_values()
         else:
             self.run_conversions(addr_type)
+            self._change_token += 1
+        self._last_input = input_key
 
         # call callbacks
         self.run_callbacks(addr_type)
+        return True
+
+    def _start_background(self, value: str, addr_type: int):
+        # Refuse oversized values right away, as set_value does without background mode
+        if addr_type != ADDRTYPE.DOTTED:
+            _conversions._checkDigits(value)
+        self._change_token += 1
+        self._input_type = addr_type
+        self._input_reverse = self.reverse
+        self._pending_types.clear()
+        for typeval in self._supported_addr_types:
+            if typeval != addr_type:
+                self._values[typeval] = ''
+        self._background_token = self._change_token
+        self._background_future = self._executor.submit(
+            self._run_background, self._change_token, value, addr_type, self.reverse
+        )
+        if self._busy_callback:
+            self._busy_callback(True)
 
     def _check_addr_type(self, addr_type: int):
         if not self.is_addr_type_supported(addr_type):
@@ -19,33 +19,68 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
-import re
-
-
-# regex for matching decimal, dotted-quad and hex IP - including compiled versions for performance
+# regex for matching decimal, dotted-quad and hex IP - the compiled versions (*_REC) are compiled on first use,
+# see __getattr__ below, so importing this module does not pay for re or the compiles
 DECIP_RE = r'^([0-9]{1,10})$'
-DECIP_REC = re.compile(DECIP_RE)
 
 HEXIP_RE = r'^((0[xX])?[0-9a-fA-F]{1,8})$'
-HEXIP_REC = re.compile(HEXIP_RE)
 
 # Requires 0-255 before and after each '.', up to 3 instances of '.'
 DOTTEDQUADIP_RE = r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){0,3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-DOTTEDQUADIP_REC = re.compile(DOTTEDQUADIP_RE)
 
 IP_RELIST = [DECIP_RE, HEXIP_RE, DOTTEDQUADIP_RE]
-IP_RECLIST = [DECIP_REC, HEXIP_REC, DOTTEDQUADIP_REC]
 
 # Requires 0-255 before and after each '.' with 3 instances of '.'
 DOTTEDQUADIP_STRICTRE = r'^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$'
-DOTTEDQUADIP_STRICTREC = re.compile(DOTTEDQUADIP_STRICTRE)
 
-# regex for matching general decimal and hex - including compiled versions for performance
+# regex for matching general decimal and hex
 DEC_RE = r'^([0-9]+)$'
-DEC_REC = re.compile(DEC_RE)
 
 HEX_RE = r'^((0[xX])?[0-9a-fA-F]+)$'
-HEX_REC = re.compile(HEX_RE)
 
 RELIST = [DEC_RE, HEX_RE]
-RECLIST = [DEC_REC, HEX_REC]
+
+# Unanchored pattern for finding dotted-quad, 0x-prefixed hex and decimal IPs embedded in text.
+# The guards keep it from matching part of a longer word, number or dotted value (e.g. a version 1.2.3.4.5)
+SCAN_RE = (
+    r'(?<!\w)(?<!\w\.)(?:'
+    r'(?P<dotted>(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?))'
+    r'|(?P<hex>0[xX][0-9a-fA-F]{1,8})'
+    r'|(?P<dec>[0-9]{1,10})'
+    r')(?!\w)(?!\.\w)'
+)
+
+# Matches the last character in a str that can not be part of an address, used to find safe places to split text
+SCAN_SEPARATOR_RE = r'[^\w.](?=[\w.]*\Z)'
+
+# Compiled name: the pattern it is compiled from, or a tuple of compiled names for the lists
+_COMPILED = {
+    'DECIP_REC': 'DECIP_RE',
+    'HEXIP_REC': 'HEXIP_RE',
+    'DOTTEDQUADIP_REC': 'DOTTEDQUADIP_RE',
+    'IP_RECLIST': ('DECIP_REC', 'HEXIP_REC', 'DOTTEDQUADIP_REC'),
+    'DOTTEDQUADIP_STRICTREC': 'DOTTEDQUADIP_STRICTRE',
+    'DEC_REC': 'DEC_RE',
+    'HEX_REC': 'HEX_RE',
+    'RECLIST': ('DEC_REC', 'HEX_REC'),
+    'SCAN_REC': 'SCAN_RE',
+    'SCAN_SEPARATOR_REC': 'SCAN_SEPARATOR_RE'
+}
+
+
+def __getattr__(name: str):
+    """Compile a *_REC value on first access and keep it as a regular module attribute"""
+    source = _COMPILED.get(name)
+    if source is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    if isinstance(source, tuple):
+        value = [globals().get(compiled_name) or __getattr__(compiled_name) for compiled_name in source]
+    else:
+        import re
+        value = re.compile(globals()[source])
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_COMPILED))
@@ -19,60 +19,104 @@
 # If not, see <https://www.gnu.org/licenses/>.
 
 
-import string
 from .globals import ADDRTYPE
 
 
-dec_allowed_ascii = [ord(ch) for ch in string.digits]
+# Same as string.digits and string.hexdigits, without importing string (which imports re)
+dec_allowed_chars = '0123456789'
+hex_allowed_chars = '0123456789abcdefABCDEF'
+
+dec_allowed_ascii = [ord(ch) for ch in dec_allowed_chars]
 dotted_allowed_ascii = dec_allowed_ascii + [ord('.')]
-hex_allowed_ascii = [ord(ch) for ch in string.hexdigits]
+hex_allowed_ascii = [ord(ch) for ch in hex_allowed_chars]
+
+# Lookup tables for each ADDRTYPE: allowed characters, allowed key codes and the bytes to delete with translate()
+_ALLOWED_CHARS = {
+    ADDRTYPE.DEC: dec_allowed_chars,
+    ADDRTYPE.DOTTED: dec_allowed_chars + '.',
+    ADDRTYPE.HEX: hex_allowed_chars
+}
+_ALLOWED_ASCII = {
+    ADDRTYPE.DEC: frozenset(dec_allowed_ascii),
+    ADDRTYPE.DOTTED: frozenset(dotted_allowed_ascii),
+    ADDRTYPE.HEX: frozenset(hex_allowed_ascii)
+}
+_DELETE_BYTES = {
+    addr_type: bytes(byte for byte in range(256) if byte not in allowed_ascii)
+    for addr_type, allowed_ascii in _ALLOWED_ASCII.items()
+}
+
+# State of a partially typed dotted-quad value for feedDottedQuad():
+# (number of parts, digits in the last part, value of the last part), this one is the state of ''
+DOTTED_QUAD_START = (1, 0, 0)
+_DIGIT_VALUES = {char: value for value, char in enumerate(dec_allowed_chars)}
+
+
+def feedDottedQuad(state: tuple, chars: str) -> tuple:
+    """
+    Advance a dotted-quad parse state by characters added at the end of the value, in O(1) per character.
+    A value can still become a valid address while it has at most four parts, no empty part except the last,
+    and at most three digits with a value up to 255 per part.
+    :param state: tuple from DOTTED_QUAD_START or a previous call
+    :param chars: str characters added to the value
+    :return: tuple new state, or None if the value can no longer become a valid address
+    """
+    part_count, digit_count, part_value = state
+    for char in chars:
+        if char == '.':
+            if (digit_count == 0) or (part_count == 4):
+                return None
+            part_count += 1
+            digit_count = 0
+            part_value = 0
+        else:
+            digit_value = _DIGIT_VALUES.get(char)
+            if (digit_value is None) or (digit_count == 3):
+                return None
+            part_value = (part_value * 10) + digit_value
+            if part_value > 255:
+                return None
+            digit_count += 1
+    return part_count, digit_count, part_value
 
 
 def filterASCII(key_codes: list, addr_type: int) -> list:
-    if addr_type == ADDRTYPE.DEC:
-        retval = [key for key in key_codes if key in dec_allowed_ascii]
-    elif addr_type == ADDRTYPE.DOTTED:
-        retval = [key for key in key_codes if key in dotted_allowed_ascii]
-    elif addr_type == ADDRTYPE.HEX:
-        retval = [key for key in key_codes if key in hex_allowed_ascii]
-    else:
-        raise ValueError(f'addr_type of {addr_type} is not valid')
-    return retval
+    allowed_ascii = _lookup(_ALLOWED_ASCII, addr_type)
+    return [key for key in key_codes if key in allowed_ascii]
+
+
+def filterBytes(data: bytes, addr_type: int) -> bytes:
+    """
+    Same as filterChars() for ASCII bytes, e.g. data read from a file or socket without decoding it.
+    :param data: bytes or bytearray, the result has the same type
+    """
+    return data.translate(None, _lookup(_DELETE_BYTES, addr_type))
 
 
 def filterChars(chars: str, addr_type: int) -> str:
-    if addr_type == ADDRTYPE.DEC:
-        retval = ''.join(ch for ch in chars if ch in string.digits)
-    elif addr_type == ADDRTYPE.DOTTED:
-        retval = ''.join(ch for ch in chars if ch in string.digits or ch in '.')
-    elif addr_type == ADDRTYPE.HEX:
-        retval = ''.join(ch for ch in chars if ch in string.hexdigits)
-    else:
-        raise ValueError(f'addr_type of {addr_type} is not valid')
-    return retval
+    # Only ASCII characters are ever allowed, so the rest can be dropped while encoding.
+    # Deleting with bytes.translate() then handles large pastes in a single pass in C.
+    delete_bytes = _lookup(_DELETE_BYTES, addr_type)
+    return chars.encode('ascii', 'ignore').translate(None, delete_bytes).decode('ascii')
 
 
 def isAllowedASCII(key_code: int, addr_type: int) -> bool:
-    if addr_type == ADDRTYPE.DEC:
-        retval = key_code in dec_allowed_ascii
-    elif addr_type == ADDRTYPE.DOTTED:
-        retval = key_code in dotted_allowed_ascii
-    elif addr_type == ADDRTYPE.HEX:
-        retval = key_code in hex_allowed_ascii
-    else:
-        raise ValueError(f'addr_type of {addr_type} is not valid')
-    return retval
+    return key_code in _lookup(_ALLOWED_ASCII, addr_type)
+
+
+def isAllowedDottedQuadPrefix(chars: str) -> bool:
+    """Return whether chars is a dotted-quad value, complete or not yet, that can still become a valid address"""
+    return feedDottedQuad(DOTTED_QUAD_START, chars) is not None
 
 
 def isAllowedChar(char: str, addr_type: int) -> bool:
     if (len(char) != 1):
         raise ValueError(f'char input includes more than one character: {char}')
-    if addr_type == ADDRTYPE.DEC:
-        retval = char in string.digits
-    elif addr_type == ADDRTYPE.DOTTED:
-        retval = char in string.digits or char in '.'
-    elif addr_type == ADDRTYPE.HEX:
-        retval = char in string.hexdigits
-    else:
-        raise ValueError(f'addr_type of {addr_type} is not valid')
-    return retval
+    return char in _lookup(_ALLOWED_CHARS, addr_type)
+
+
+def _lookup(tables: dict, addr_type: int):
+    try:
+        return tables[addr_type]
+    except (KeyError, TypeError):
+        raise ValueError(f'addr_type of {addr_type} is not valid') from None
@@ -29,6 +29,12 @@ V4MASKS = [255 << (8*octet_offset) for octet_offset in range(4)]
 V4MAXVAL = int('0xffffffff', 16)  # 4294967295 or 255.255.255.255
 
 
+# lookup tables for dotted-quad octets: decimal str for each value, value for each str and the matching hex pair
+OCTET_STRINGS = tuple(str(octet) for octet in range(256))
+OCTET_VALUES = {octet_str: octet for octet, octet_str in enumerate(OCTET_STRINGS)}
+OCTET_HEX_PAIRS = {octet_str: f'{octet:02x}' for octet, octet_str in enumerate(OCTET_STRINGS)}
+
+
 # enum values that can be used for index of the IP_RE*LIST items
 @enum.unique
 class ADDRTYPE(enum.IntEnum):
@@ -36,3 +42,7 @@ class ADDRTYPE(enum.IntEnum):
     DEC = 0
     HEX = 1
     DOTTED = 2
+
+
+# lower-case names for the ADDRTYPE values, as used on the command line and in the HTTP service
+ADDRTYPE_NAMES = {'dec': ADDRTYPE.DEC, 'hex': ADDRTYPE.HEX, 'dotted': ADDRTYPE.DOTTED}
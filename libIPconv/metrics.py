@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Opt-in instrumentation of conversions, validations and Converter.set_value calls.
+
+    from libIPconv import metrics
+    registry = metrics.enable()
+    ...
+    print(registry.snapshot())
+    print(registry.to_prometheus())
+    metrics.disable()
+
+While disabled (the default) the instrumented functions only check a single module variable.
+"""
+
+
+import threading
+import time
+from bisect import bisect_left
+from . import conversions
+from .globals import ADDRTYPE
+
+
+# upper bounds (in seconds) of the latency histogram buckets, a +Inf bucket is added
+LATENCY_BUCKETS = (1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.001, 0.01, 0.1, 1.0)
+
+
+class Histogram(object):
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Return the count, sum and cumulative bucket counts keyed by upper bound"""
+        cumulative = {}
+        running_total = 0
+        for upper_bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running_total += count
+            cumulative[upper_bound] = running_total
+        return {'count': self.count, 'sum': self.sum, 'buckets': cumulative}
+
+
+class MetricsRegistry(object):
+    """Counters and latency histograms keyed by ADDRTYPE names"""
+
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def measure_conversion(self, input_val: str, input_type: int, output_type: int, reverse: bool, safe: bool,
+                           cache) -> str:
+        """Run a convertStrToType() call, recording its count, latency and outcome"""
+        start_time = self.clock()
+        try:
+            if cache is not None:
+                result = cache.convert(input_val, input_type, output_type, reverse=reverse)
+            else:
+                result = conversions._convert(input_val, input_type, output_type, reverse)
+        except ValueError as error:
+            swallowed = safe and not isinstance(error, conversions.InputTooLargeError)
+            self._record_conversion(input_type, output_type, self.clock() - start_time, 'swallowed' if swallowed else 'raised')
+            if swallowed:
+                return ''
+            raise
+        outcome = 'empty' if (input_val and not result) else 'ok'
+        self._record_conversion(input_type, output_type, self.clock() - start_time, outcome)
+        return result
+
+    def record_set_value(self, addr_type: int, seconds: float):
+        """
+        Count a Converter.set_value() call, repeats of the last input included.
+        With background mode the latency only covers starting the background conversion.
+        """
+        key = _type_name(addr_type)
+        with self._lock:
+            self.set_value_calls[key] = self.set_value_calls.get(key, 0) + 1
+            self._get_histogram(self.set_value_latency, key).observe(seconds)
+
+    def record_validation(self, addr_type: int, valid: bool) -> bool:
+        """Count an isValidIPv4() result and return it unchanged"""
+        key = (_type_name(addr_type), valid)
+        with self._lock:
+            self.validations[key] = self.validations.get(key, 0) + 1
+        return valid
+
+    def reset(self):
+        with self._lock:
+            self.conversions = {}  # (input_type, output_type) -> count
+            self.conversion_errors = {}  # (input_type, output_type, 'raised' or 'swallowed') -> count
+            self.empty_results = {}  # (input_type, output_type) -> count of non-empty input giving '' without error
+            self.conversion_latency = {}  # (input_type, output_type) -> Histogram
+            self.validations = {}  # (addr_type, valid) -> count
+            self.set_value_calls = {}  # addr_type -> count
+            self.set_value_latency = {}  # addr_type -> Histogram
+
+    def snapshot(self) -> dict:
+        """Return a copy of all metrics as plain dicts, with tuple keys joined by '/'"""
+        with self._lock:
+            return {
+                'conversions': _join_keys(self.conversions),
+                'conversion_errors': _join_keys(self.conversion_errors),
+                'empty_results': _join_keys(self.empty_results),
+                'conversion_latency': {
+                    key: histogram.snapshot() for key, histogram in _join_keys(self.conversion_latency).items()
+                },
+                'validations': {f'{addr_type}/{"valid" if valid else "invalid"}': count
+                                for (addr_type, valid), count in self.validations.items()},
+                'set_value_calls': dict(self.set_value_calls),
+                'set_value_latency': {key: histogram.snapshot() for key, histogram in self.set_value_latency.items()}
+            }
+
+    def to_prometheus(self) -> str:
+        """Return all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            _add_counter(lines, 'libipconv_conversions_total', 'Conversions by input and output type',
+                         ('input_type', 'output_type'), self.conversions)
+            _add_counter(lines, 'libipconv_conversion_errors_total',
+                         'Conversions failing with ValueError, raised or swallowed by safe=True',
+                         ('input_type', 'output_type', 'handling'), self.conversion_errors)
+            _add_counter(lines, 'libipconv_conversion_empty_results_total',
+                         'Conversions of non-empty input returning an empty value without an error',
+                         ('input_type', 'output_type'), self.empty_results)
+            _add_histogram(lines, 'libipconv_conversion_seconds', 'Conversion latency',
+                           ('input_type', 'output_type'), self.conversion_latency)
+            _add_counter(lines, 'libipconv_validations_total', 'isValidIPv4 results for str input by addr_type',
+                         ('addr_type', 'valid'),
+                         {(addr_type, str(valid).lower()): count for (addr_type, valid), count in self.validations.items()})
+            _add_counter(lines, 'libipconv_set_value_total', 'Converter.set_value calls by addr_type',
+                         ('addr_type',), {(key,): count for key, count in self.set_value_calls.items()})
+            _add_histogram(lines, 'libipconv_set_value_seconds',
+                           'Converter.set_value latency including callbacks, background conversions until started',
+                           ('addr_type',), {(key,): histogram for key, histogram in self.set_value_latency.items()})
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _get_histogram(histograms: dict, key) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram()
+        return histogram
+
+    def _record_conversion(self, input_type: int, output_type: int, seconds: float, outcome: str):
+        key = (_type_name(input_type), _type_name(output_type))
+        with self._lock:
+            self.conversions[key] = self.conversions.get(key, 0) + 1
+            if outcome == 'empty':
+                self.empty_results[key] = self.empty_results.get(key, 0) + 1
+            elif outcome != 'ok':
+                error_key = key + (outcome,)
+                self.conversion_errors[error_key] = self.conversion_errors.get(error_key, 0) + 1
+            self._get_histogram(self.conversion_latency, key).observe(seconds)
+
+
+def disable():
+    """Stop collecting metrics, the registry that was in use keeps its values"""
+    conversions._metrics = None
+
+
+def enable(registry: MetricsRegistry = None) -> MetricsRegistry:
+    """Start collecting metrics in the given registry (or a new one) and return it"""
+    if registry is None:
+        registry = MetricsRegistry()
+    conversions._metrics = registry
+    return registry
+
+
+def get_registry():
+    """Return the registry in use, or None if metrics are disabled"""
+    return conversions._metrics
+
+
+def _add_counter(lines: list, name: str, description: str, label_names: tuple, values: dict):
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} counter')
+    for label_values, count in sorted(values.items()):
+        lines.append(f'{name}{_format_labels(label_names, label_values)} {count}')
+
+
+def _add_histogram(lines: list, name: str, description: str, label_names: tuple, histograms: dict):
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} histogram')
+    for label_values, histogram in sorted(histograms.items()):
+        snapshot = histogram.snapshot()
+        for upper_bound, count in snapshot['buckets'].items():
+            bucket_label = '+Inf' if upper_bound == float('inf') else repr(upper_bound)
+            labels = _format_labels(label_names + ('le',), label_values + (bucket_label,))
+            lines.append(f'{name}_bucket{labels} {count}')
+        labels = _format_labels(label_names, label_values)
+        lines.append(f'{name}_sum{labels} {snapshot["sum"]!r}')
+        lines.append(f'{name}_count{labels} {snapshot["count"]}')
+
+
+def _format_labels(label_names: tuple, label_values: tuple) -> str:
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(label_names, label_values)) + '}'
+
+
+def _join_keys(values: dict) -> dict:
+    return {'/'.join(key): value for key, value in values.items()}
+
+
+def _type_name(addr_type: int) -> str:
+    try:
+        return ADDRTYPE(addr_type).name.lower()
+    except ValueError:
+        return str(addr_type)
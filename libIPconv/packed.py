@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Reading and writing IPv4 addresses as packed uint32 records, as exchanged with C tools.
+
+Records are big-endian (network byte order) by default, reverse=True means little-endian records.
+Any object supporting the buffer protocol can be read: bytes, bytearray, memoryview, array or mmap.
+"""
+
+
+import sys
+from array import array
+from .conversions import parseIPv4
+from .globals import ADDRTYPE, OCTET_STRINGS
+
+
+# array typecode for a 4-byte unsigned int
+UINT32_TYPECODE = 'I' if (array('I').itemsize == 4) else 'L'
+
+_NATIVE_BIG_ENDIAN = (sys.byteorder == 'big')
+
+
+def format_packed(buffer, output_type: int, reverse: bool = False) -> list:
+    """
+    Format packed records as a list of str values of the given ADDRTYPE.
+    Hex values are formatted with eight digits and dotted-quad values with four octets.
+    Hex and dotted-quad formatting work on the bytes directly and do not create an int for each record.
+    """
+    data = _big_endian_bytes(buffer, reverse)
+    if output_type == ADDRTYPE.HEX:
+        hex_data = data.hex()
+        return [hex_data[position:position + 8] for position in range(0, len(hex_data), 8)]
+    elif output_type == ADDRTYPE.DOTTED:
+        octet_strings = iter(map(OCTET_STRINGS.__getitem__, data))
+        return list(map('.'.join, zip(octet_strings, octet_strings, octet_strings, octet_strings)))
+    elif output_type == ADDRTYPE.DEC:
+        return list(map(str, read_packed(data)))
+    else:
+        raise ValueError(f'output_type of {output_type} is not valid')
+
+
+def pack_values(input_values, input_type: int, reverse: bool = False) -> bytes:
+    """
+    Parse str values of the given ADDRTYPE into packed records.
+    Raises ValueError for values that are not valid IPv4 addresses (dotted-quad values need four octets).
+    """
+    int_values = array(UINT32_TYPECODE)
+    for input_value in input_values:
+        int_value = parseIPv4(input_value, input_type, strict=True)[1]
+        if int_value < 0:
+            raise ValueError(f'Not a valid IPv4 address: {input_value!r}')
+        int_values.append(int_value)
+    return write_packed(int_values, reverse=reverse)
+
+
+def read_packed(buffer, reverse: bool = False) -> array:
+    """Read packed records from a buffer into an array of int values, byte-swapping in place if needed"""
+    view = memoryview(buffer).cast('B')
+    if len(view) % 4:
+        raise ValueError(f'Buffer length {len(view)} is not a multiple of 4 bytes')
+    int_values = array(UINT32_TYPECODE)
+    int_values.frombytes(view)
+    if reverse == _NATIVE_BIG_ENDIAN:
+        int_values.byteswap()
+    return int_values
+
+
+def view_packed(buffer) -> memoryview:
+    """
+    Return a zero-copy memoryview of native-endian uint32 records over a buffer.
+    Use this when the records are known to be in native byte order (sys.byteorder), otherwise use read_packed().
+    """
+    view = memoryview(buffer).cast('B')
+    if len(view) % 4:
+        raise ValueError(f'Buffer length {len(view)} is not a multiple of 4 bytes')
+    return view.cast(UINT32_TYPECODE)
+
+
+def write_packed(int_values, output_file=None, reverse: bool = False):
+    """
+    Pack int values (any iterable, including an array) into records.
+    :param int_values: iterable of int values in the IPv4 range
+    :param output_file: optional binary file object to write the records to
+    :param reverse: bool for whether to write little-endian instead of big-endian records
+    :return: bytes of the records, or None if output_file was given
+    """
+    try:
+        # Always a copy, so swapping bytes below never modifies an array passed in
+        packed_values = array(UINT32_TYPECODE, int_values)
+    except OverflowError as error:
+        raise ValueError(f'Value is outside of IPv4 range: {error}') from None
+    if reverse == _NATIVE_BIG_ENDIAN:
+        packed_values.byteswap()
+    if output_file is None:
+        return packed_values.tobytes()
+    packed_values.tofile(output_file)
+
+
+def _big_endian_bytes(buffer, reverse: bool):
+    """Return the records of a buffer in big-endian order, only copying when the bytes need to be swapped"""
+    view = memoryview(buffer).cast('B')
+    if len(view) % 4:
+        raise ValueError(f'Buffer length {len(view)} is not a multiple of 4 bytes')
+    if not reverse:
+        return view
+    swapped = array(UINT32_TYPECODE)
+    swapped.frombytes(view)
+    swapped.byteswap()
+    return memoryview(swapped).cast('B')
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Multi-process conversion of large files.
+
+The input file is split into chunks at line boundaries, the chunks are converted in a process pool,
+and the results are written in the original order.
+"""
+
+
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .conversions import get_converter
+
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # bytes of input per chunk, adjusted to the next line boundary
+
+
+def convert_file(input_path: str, output_path: str, input_type: int, output_type: int, reverse: bool = False,
+                 workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Convert a file with one value per line, writing one converted value per line to output_path.
+    Blank lines and values that can not be converted result in blank output lines, so lines stay aligned.
+    :param input_path: str path of the file to read
+    :param output_path: str path of the file to write
+    :param input_type: int value type from ADDRTYPE enum determining what the source type is
+    :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
+    :param reverse: bool for whether or not to reverse the byte-order
+    :param workers: int number of worker processes, defaults to the number of CPUs
+    :param chunk_size: int approximate number of input bytes handled by a worker at a time
+    :return: dict of statistics, including a 'workers' dict of throughput keyed by worker process id
+    """
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, got {chunk_size}')
+    get_converter(input_type, output_type, reverse)  # raise for unsupported types before starting any workers
+
+    start_time = time.perf_counter()
+    chunks = split_chunks(input_path, chunk_size)
+    worker_stats = {}
+    totals = {'lines': 0, 'bytes': 0, 'errors': 0}
+
+    worker_count = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=worker_count) as executor, open(output_path, 'wb') as output_file:
+        # Limit the chunks in flight so memory use does not depend on the file size
+        pending = deque()
+        chunk_iter = iter(chunks)
+        while True:
+            while len(pending) < (worker_count * 2):
+                chunk = next(chunk_iter, None)
+                if chunk is None:
+                    break
+                pending.append(executor.submit(_convert_chunk, input_path, *chunk, input_type, output_type, reverse))
+            if not pending:
+                break
+            output_data, chunk_stats = pending.popleft().result()
+            output_file.write(output_data)
+            _add_stats(worker_stats, totals, chunk_stats)
+
+    elapsed = time.perf_counter() - start_time
+    for stats in worker_stats.values():
+        stats['lines_per_second'] = (stats['lines'] / stats['seconds']) if stats['seconds'] else 0.0
+        stats['bytes_per_second'] = (stats['bytes'] / stats['seconds']) if stats['seconds'] else 0.0
+    return {
+        'chunks': len(chunks), 'lines': totals['lines'], 'bytes': totals['bytes'], 'errors': totals['errors'],
+        'seconds': elapsed, 'lines_per_second': (totals['lines'] / elapsed) if elapsed else 0.0,
+        'workers': worker_stats
+    }
+
+
+def split_chunks(input_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
+    """Return a list of (start, end) byte offsets for chunks of roughly chunk_size that end on line boundaries"""
+    chunks = []
+    file_size = os.path.getsize(input_path)
+    if not file_size:
+        return chunks
+    with open(input_path, 'rb') as input_file, \
+            mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+        start = 0
+        while start < file_size:
+            end = start + chunk_size
+            if end >= file_size:
+                end = file_size
+            else:
+                newline_position = mapped_file.find(b'\n', end - 1)
+                end = file_size if (newline_position == -1) else (newline_position + 1)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def _add_stats(worker_stats: dict, totals: dict, chunk_stats: dict):
+    stats = worker_stats.setdefault(chunk_stats['pid'], {'chunks': 0, 'lines': 0, 'bytes': 0, 'seconds': 0.0})
+    stats['chunks'] += 1
+    for key in ('lines', 'bytes', 'seconds'):
+        stats[key] += chunk_stats[key]
+    for key in ('lines', 'bytes', 'errors'):
+        totals[key] += chunk_stats[key]
+
+
+def _convert_chunk(input_path: str, start: int, end: int, input_type: int, output_type: int, reverse: bool) -> tuple:
+    """Worker function: convert the lines between two byte offsets, returning the output bytes and statistics"""
+    start_time = time.perf_counter()
+    conversion_function = get_converter(input_type, output_type, reverse)
+    with open(input_path, 'rb') as input_file, \
+            mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+        # latin-1 maps every byte to one character, anything unexpected then fails conversion
+        lines = mapped_file[start:end].decode('latin-1').split('\n')
+    if not lines[-1]:
+        lines.pop()  # the chunk ends with a newline
+
+    results = []
+    error_count = 0
+    for line in lines:
+        line = line.strip()
+        result = ''
+        if line:
+            try:
+                result = conversion_function(line)
+            except ValueError:
+                error_count += 1
+            else:
+                # Invalid hex and decimal values convert to '' instead of raising
+                if not result:
+                    error_count += 1
+        results.append(result)
+    results.append('')
+
+    chunk_stats = {
+        'pid': os.getpid(), 'lines': len(lines), 'bytes': end - start, 'errors': error_count,
+        'seconds': time.perf_counter() - start_time
+    }
+    return '\n'.join(results).encode('latin-1'), chunk_stats
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Find IPv4 addresses embedded in arbitrary text (such as log lines) and annotate or rewrite them.
+
+All supported formats are found in a single pass with one combined pattern (SCAN_REC in convregex).
+Hex values need a 0x prefix to be found, since plain hex digits are indistinguishable from words and numbers.
+"""
+
+
+from .conversions import formatIPv4
+from .convregex import SCAN_REC, SCAN_SEPARATOR_REC
+from .globals import ADDRTYPE, V4MAXVAL
+
+
+ALL_ADDR_TYPES = frozenset([ADDRTYPE.DEC, ADDRTYPE.HEX, ADDRTYPE.DOTTED])
+
+# default template for annotate(), keeping the original text and adding the converted value
+ANNOTATE_TEMPLATE = '{match} [{converted}]'
+
+# text without a place to split it is processed anyway once the pending text reaches this size
+MAX_PENDING_SIZE = 64 * 1024
+
+_GROUP_TYPES = {'dotted': ADDRTYPE.DOTTED, 'hex': ADDRTYPE.HEX, 'dec': ADDRTYPE.DEC}
+
+
+def annotate(text: str, output_type: int, addr_types=ALL_ADDR_TYPES, reverse: bool = False,
+             template: str = ANNOTATE_TEMPLATE) -> str:
+    """
+    Rewrite every address found in text using template.
+    Addresses that are already of output_type are left unchanged.
+    :param text: str to search
+    :param output_type: int value type from the ADDRTYPE enum for the converted values
+    :param addr_types: collection of ADDRTYPE values to look for
+    :param reverse: bool for whether or not to reverse the byte-order
+    :param template: str.format() template with {match} (the original text) and {converted} fields,
+                     use '{converted}' to replace the addresses
+    :return: str with the addresses annotated
+    """
+    pieces = []
+    position = 0
+    for start, end, addr_type, int_value in find_addresses(text, addr_types):
+        if addr_type == output_type:
+            continue
+        pieces.append(text[position:start])
+        pieces.append(template.format(match=text[start:end], converted=format_address(int_value, output_type, reverse)))
+        position = end
+    if not pieces:
+        return text
+    pieces.append(text[position:])
+    return ''.join(pieces)
+
+
+def annotate_stream(chunks, output_type: int, addr_types=ALL_ADDR_TYPES, reverse: bool = False,
+                    template: str = ANNOTATE_TEMPLATE):
+    """
+    Streaming form of annotate() for an iterable of str chunks, such as blocks read from a file.
+    Text is held back at the end of each chunk until a character that can not be part of an address is seen,
+    so addresses split across chunks are still found.
+    :return: generator of annotated str chunks
+    """
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        separator_match = SCAN_SEPARATOR_REC.search(pending)
+        if separator_match:
+            split_position = separator_match.end()
+        elif len(pending) >= MAX_PENDING_SIZE:
+            split_position = len(pending)
+        else:
+            continue
+        if split_position:
+            yield annotate(pending[:split_position], output_type, addr_types, reverse, template)
+            pending = pending[split_position:]
+    if pending:
+        yield annotate(pending, output_type, addr_types, reverse, template)
+
+
+def find_addresses(text: str, addr_types=ALL_ADDR_TYPES):
+    """
+    Find every address of the given ADDRTYPE values in text.
+    Decimal numbers larger than the IPv4 range are skipped.
+    :return: generator of tuples (start, end, addr_type, int_value)
+    """
+    for match in SCAN_REC.finditer(text):
+        addr_type = _GROUP_TYPES[match.lastgroup]
+        if addr_type not in addr_types:
+            continue
+        value = match.group()
+        if addr_type == ADDRTYPE.DOTTED:
+            int_value = 0
+            for octet in value.split('.'):
+                int_value = (int_value << 8) | int(octet)
+        elif addr_type == ADDRTYPE.HEX:
+            int_value = int(value, 16)
+        else:
+            int_value = int(value)
+            if int_value > V4MAXVAL:
+                continue
+        yield match.start(), match.end(), addr_type, int_value
+
+
+def format_address(int_value: int, output_type: int, reverse: bool = False) -> str:
+    """Format an int IPv4 address value, hex values are formatted with a 0x prefix and eight digits"""
+    return formatIPv4(int_value, output_type, reverse, hex_prefix='0x')
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Local asyncio HTTP service for conversions, so other programs do not need to import libIPconv themselves.
+Only the standard library is used. Run with: python -m libIPconv.service --port 8080
+
+Endpoints (all responses are JSON):
+    GET  /convert?value=c0a80101&to=dotted[&from=hex][&reverse=1]
+    GET  /validate?value=192.168.1.1[&type=dotted][&strict=1]
+    POST /convert/batch?to=dotted[&from=hex][&reverse=1]   with a JSON array of str values as the body
+    GET  /stats                                            request latency histograms and batching statistics
+
+Single-value requests that arrive concurrently are coalesced and processed as one batch.
+A value that can not be converted is answered with 400 by /convert and results in null from /convert/batch.
+When too many requests are queued or too many connections are open, requests are answered with 503.
+"""
+
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+from .conversions import InputTooLargeError, get_converter, parseIPv4
+from .globals import ADDRTYPE, ADDRTYPE_NAMES
+
+
+# upper bounds (in milliseconds) of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# paths with their own latency histogram, requests for any other path are counted under 'other'
+LATENCY_PATHS = frozenset(['/convert', '/validate', '/convert/batch'])
+
+_STATUS_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'
+}
+
+
+class HTTPError(Exception):
+    """Raised while handling a request to answer it with an error status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyHistogram(object):
+    """Histogram of latencies with fixed millisecond buckets (counts are per bucket, not cumulative)"""
+
+    def __init__(self, buckets_ms: tuple = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, seconds: float):
+        milliseconds = seconds * 1000
+        self.count += 1
+        self.total_ms += milliseconds
+        for index, upper_bound in enumerate(self.buckets_ms):
+            if milliseconds <= upper_bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def snapshot(self) -> dict:
+        bucket_names = [f'<={upper_bound}ms' for upper_bound in self.buckets_ms] + [f'>{self.buckets_ms[-1]}ms']
+        return {
+            'count': self.count,
+            'mean_ms': (self.total_ms / self.count) if self.count else 0.0,
+            'buckets': dict(zip(bucket_names, self.counts))
+        }
+
+
+class ConversionService(object):
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, max_batch_size: int = 512,
+                 max_pending: int = 10000, max_connections: int = 512, max_body_size: int = 1024 * 1024):
+        """
+        :param host: str address to listen on
+        :param port: int port to listen on, 0 picks a free port
+        :param max_batch_size: int maximum number of single-value requests processed together
+        :param max_pending: int maximum number of queued single-value requests before answering 503
+        :param max_connections: int maximum number of open connections before answering 503
+        :param max_body_size: int maximum request body size in bytes before answering 413
+        """
+        self.host = host
+        self.port = port
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.max_connections = max_connections
+        self.max_body_size = max_body_size
+        self.batch_count = 0
+        self.batched_requests = 0
+        self.rejected_requests = 0
+        self.latencies = {}
+        self._connection_count = 0
+        self._queue = None
+        self._server = None
+        self._batch_task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._batch_task = asyncio.get_running_loop().create_task(self._process_batches())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batch_task:
+            self._batch_task.cancel()
+            self._batch_task = None
+        # Requests still queued would otherwise wait forever
+        while self._queue and not self._queue.empty():
+            job, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(HTTPError(503, 'Service is shutting down'))
+
+    async def serve_forever(self):
+        if not self._server:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def stats(self) -> dict:
+        return {
+            'batches': self.batch_count,
+            'batched_requests': self.batched_requests,
+            'mean_batch_size': (self.batched_requests / self.batch_count) if self.batch_count else 0.0,
+            'pending': self._queue.qsize() if self._queue else 0,
+            'connections': self._connection_count,
+            'rejected_requests': self.rejected_requests,
+            'latency': {path: histogram.snapshot() for path, histogram in self.latencies.items()}
+        }
+
+    async def _dispatch(self, method: str, path: str, query: dict, body: bytes):
+        if path == '/convert':
+            self._check_method(method, 'GET')
+            value = self._get_param(query, 'value')
+            input_type, output_type, reverse = self._get_conversion_params(query)
+            return await self._submit(('convert', value, input_type, output_type, reverse))
+        elif path == '/validate':
+            self._check_method(method, 'GET')
+            value = self._get_param(query, 'value')
+            addr_type = self._get_type_param(query, 'type', ADDRTYPE.NONE)
+            strict = self._get_bool_param(query, 'strict')
+            return await self._submit(('validate', value, addr_type, strict))
+        elif path == '/convert/batch':
+            self._check_method(method, 'POST')
+            input_type, output_type, reverse = self._get_conversion_params(query)
+            try:
+                values = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, 'Request body is not valid JSON') from None
+            if not (isinstance(values, list) and all(isinstance(value, str) for value in values)):
+                raise HTTPError(400, 'Request body must be a JSON array of strings')
+            return self._convert_values(values, input_type, output_type, reverse)
+        elif path == '/stats':
+            self._check_method(method, 'GET')
+            return self.stats()
+        raise HTTPError(404, f'Unknown path: {path}')
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self._connection_count >= self.max_connections:
+            self.rejected_requests += 1
+            await self._send(writer, 503, {'error': 'Too many connections'}, keep_alive=False)
+            writer.close()
+            return
+
+        self._connection_count += 1
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, keep_alive, body = request
+                    start_time = time.perf_counter()
+                    url = urlsplit(target)
+                    try:
+                        status, payload = 200, await self._dispatch(method, url.path, parse_qs(url.query), body)
+                    except HTTPError as error:
+                        if error.status == 503:
+                            self.rejected_requests += 1
+                        status, payload = error.status, {'error': str(error)}
+                    await self._send(writer, status, payload, keep_alive)
+                    if url.path != '/stats':
+                        latency_key = url.path if (url.path in LATENCY_PATHS) else 'other'
+                        self.latencies.setdefault(latency_key, LatencyHistogram()).observe(
+                            time.perf_counter() - start_time)
+                except HTTPError as error:
+                    # The request itself could not be read, the connection can not be reused
+                    await self._send(writer, error.status, {'error': str(error)}, keep_alive=False)
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connection_count -= 1
+            writer.close()
+
+    async def _process_batches(self):
+        """Take everything that has been queued up to max_batch_size and process it together"""
+        while True:
+            batch = [await self._queue.get()]
+            while (len(batch) < self.max_batch_size) and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self.batch_count += 1
+            self.batched_requests += len(batch)
+
+            converters = {}
+            for job, future in batch:
+                if future.cancelled():
+                    continue
+                try:
+                    future.set_result(self._process_job(job, converters))
+                except HTTPError as error:
+                    future.set_exception(error)
+                except Exception as error:
+                    # A failing job must not end this task, every later request would wait forever
+                    future.set_exception(HTTPError(500, f'Unable to process the request: {type(error).__name__}'))
+
+    @staticmethod
+    def _process_job(job: tuple, converters: dict) -> dict:
+        if job[0] == 'validate':
+            kind, value, addr_type, strict = job
+            detected_type = parseIPv4(value, addr_type, strict)[0]
+            valid = detected_type != ADDRTYPE.NONE
+            return {'value': value, 'valid': valid, 'type': detected_type.name.lower() if valid else None}
+
+        kind, value, input_type, output_type, reverse = job
+        result = ConversionService._convert_value(value, input_type, output_type, reverse, converters)
+        return {'value': value, 'result': result}
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Read one request, returning (method, target, keep_alive, body) or None when the connection closed"""
+        request_line = await self._read_line(reader)
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, 'Malformed request line') from None
+
+        headers = {}
+        while True:
+            header_line = await self._read_line(reader)
+            if header_line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= 100:
+                raise HTTPError(431, 'Too many headers')
+            name, _, value = header_line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            content_length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, 'Invalid Content-Length') from None
+        if content_length < 0:
+            raise HTTPError(400, 'Invalid Content-Length')
+        if content_length > self.max_body_size:
+            raise HTTPError(413, f'Request body is larger than {self.max_body_size} bytes')
+        body = await reader.readexactly(content_length) if content_length else b''
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = (connection != 'close') if (version == 'HTTP/1.1') else (connection == 'keep-alive')
+        return method, target, keep_alive, body
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader) -> bytes:
+        try:
+            return await reader.readline()
+        except ValueError:
+            # Raised by StreamReader when a line is longer than its buffer limit
+            raise HTTPError(431, 'Request line or header is too long') from None
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f'HTTP/1.1 {status} {_STATUS_REASONS.get(status, "Error")}\r\n'
+            f'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+        )
+        if status == 503:
+            head += 'Retry-After: 1\r\n'
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+        await writer.drain()
+
+    async def _submit(self, job: tuple) -> dict:
+        if self._batch_task is None:
+            raise HTTPError(503, 'Service is not running')
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((job, future))
+        except asyncio.QueueFull:
+            raise HTTPError(503, 'Too many pending requests') from None
+        return await future
+
+    @staticmethod
+    def _convert_value(value: str, input_type, output_type: int, reverse: bool, converters: dict) -> str:
+        """
+        Convert one value, detecting its type when input_type is None.
+        Raises HTTPError 400 when the value can not be converted, so /convert and /convert/batch agree.
+        :param converters: dict of functions from get_converter() reused between calls
+        """
+        if input_type is None:
+            input_type = parseIPv4(value)[0]
+            if input_type == ADDRTYPE.NONE:
+                raise HTTPError(400, f'Not a valid IPv4 address: {value!r}')
+            if input_type == output_type:
+                return value
+        key = (input_type, output_type, reverse)
+        conversion_function = converters.get(key)
+        if conversion_function is None:
+            conversion_function = converters[key] = get_converter(input_type, output_type, reverse)
+        try:
+            result = conversion_function(value)
+        except InputTooLargeError as error:
+            raise HTTPError(400, str(error)) from None
+        except ValueError:
+            result = ''
+        # Depending on the types, invalid values raise ValueError or convert to an empty str
+        if not result:
+            raise HTTPError(400, f'Not a valid {ADDRTYPE(input_type).name.lower()} value: {value!r}')
+        return result
+
+    def _convert_values(self, values: list, input_type: int, output_type: int, reverse: bool) -> list:
+        """Convert a batch request directly, it does not need to be coalesced. Failed values result in null."""
+        converters = {}
+        results = []
+        for value in values:
+            try:
+                results.append(self._convert_value(value, input_type, output_type, reverse, converters))
+            except HTTPError:
+                results.append(None)
+        return results
+
+    @staticmethod
+    def _check_method(method: str, allowed_method: str):
+        if method != allowed_method:
+            raise HTTPError(405, f'Use {allowed_method} for this path')
+
+    @staticmethod
+    def _get_bool_param(query: dict, name: str) -> bool:
+        return query.get(name, ['0'])[0].lower() in ('1', 'true', 'yes')
+
+    def _get_conversion_params(self, query: dict) -> tuple:
+        input_type = self._get_type_param(query, 'from', None)
+        output_type = self._get_type_param(query, 'to', None)
+        if output_type is None:
+            raise HTTPError(400, 'Missing parameter: to')
+        if input_type == output_type:
+            raise HTTPError(400, 'from and to must be different types')
+        return input_type, output_type, self._get_bool_param(query, 'reverse')
+
+    @staticmethod
+    def _get_param(query: dict, name: str) -> str:
+        if name not in query:
+            raise HTTPError(400, f'Missing parameter: {name}')
+        return query[name][0]
+
+    @staticmethod
+    def _get_type_param(query: dict, name: str, default):
+        if name not in query:
+            return default
+        try:
+            return ADDRTYPE_NAMES[query[name][0].lower()]
+        except KeyError:
+            raise HTTPError(400, f'{name} must be one of: {", ".join(ADDRTYPE_NAMES)}') from None
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog='python -m libIPconv.service', description='Local IP conversion HTTP service')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8080, help='port to listen on (default: %(default)s)')
+    parser.add_argument('--max-batch-size', type=int, default=512, help='default: %(default)s')
+    parser.add_argument('--max-pending', type=int, default=10000, help='default: %(default)s')
+    parser.add_argument('--max-connections', type=int, default=512, help='default: %(default)s')
+    parser.add_argument('--max-body-size', type=int, default=1024 * 1024, metavar='BYTES',
+                        help='default: %(default)s')
+    args = parser.parse_args(argv)
+
+    service = ConversionService(
+        args.host, args.port, max_batch_size=args.max_batch_size, max_pending=args.max_pending,
+        max_connections=args.max_connections, max_body_size=args.max_body_size
+    )
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Optional NumPy backend for converting whole columns of IPv4 addresses at once.
+
+This module is not imported by libIPconv itself, so NumPy is only required when it is used:
+    from libIPconv import vector
+
+Addresses are handled as uint32 arrays. Unlike the str functions in conversions, dotted-quad input
+must contain four octets and hex output always has eight digits, since every value is a full address.
+"""
+
+
+import numpy as np
+from .globals import ADDRTYPE, V4MAXVAL
+
+
+# maximum str length for a valid address of each type, 0x prefix included for hex
+_MAX_LENGTHS = {ADDRTYPE.DEC: 10, ADDRTYPE.HEX: 10, ADDRTYPE.DOTTED: 15}
+
+# shift amounts for splitting a uint32 into octets (most significant first) or nibbles
+_OCTET_SHIFTS = np.array([24, 16, 8, 0], dtype=np.uint32)
+_NIBBLE_SHIFTS = np.array([28, 24, 20, 16, 12, 8, 4, 0], dtype=np.uint32)
+
+# ASCII lookup tables: hex digit value for each byte (16 for invalid) and lower-case hex digit for each nibble
+_HEX_VALUES = np.full(256, 16, dtype=np.uint8)
+for _index, _char in enumerate(b'0123456789abcdef'):
+    _HEX_VALUES[_char] = _index
+for _index, _char in enumerate(b'ABCDEF'):
+    _HEX_VALUES[_char] = _index + 10
+_HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+# decimal str value for each possible octet
+_OCTET_STRINGS = np.array([str(octet) for octet in range(256)], dtype='U3')
+
+
+def convert(values, input_type: int, output_type: int, reverse: bool = False) -> np.ndarray:
+    """
+    Convert a column of addresses between ADDRTYPE formats.
+    :param values: sequence or array of str values, or an integer array when input_type is DEC
+    :param input_type: int value type from ADDRTYPE enum determining what the source type is
+    :param output_type: int value type from the ADDRTYPE enum determining what the destination type is
+    :param reverse: bool for whether or not to reverse the byte-order
+    :return: numpy str array of converted values
+    """
+    if input_type == output_type:
+        raise ValueError('output_type should be different than input_type')
+    return from_uint32(to_uint32(values, input_type, reverse), output_type)
+
+
+def from_uint32(values, output_type: int, reverse: bool = False) -> np.ndarray:
+    """
+    Format a uint32 array as a numpy str array of the requested ADDRTYPE.
+    Hex values are always formatted with eight digits and no prefix.
+    Like to_uint32(), a scalar or multi-dimensional input gives a flat array.
+    """
+    values = np.asarray(values, dtype=np.uint32).ravel()
+    if reverse:
+        values = values.byteswap()
+
+    if output_type == ADDRTYPE.DEC:
+        return values.astype('U10')
+    elif output_type == ADDRTYPE.HEX:
+        nibbles = (values[:, np.newaxis] >> _NIBBLE_SHIFTS) & 0xf
+        return _HEX_DIGITS[nibbles].view('S8').ravel().astype('U8')
+    elif output_type == ADDRTYPE.DOTTED:
+        octets = _OCTET_STRINGS[(values[:, np.newaxis] >> _OCTET_SHIFTS) & 0xff]
+        return_value = octets[:, 0]
+        for column in range(1, 4):
+            return_value = np.char.add(np.char.add(return_value, '.'), octets[:, column])
+        return return_value
+    else:
+        raise ValueError(f'output_type of {output_type} is not valid')
+
+
+def to_uint32(values, input_type: int, reverse: bool = False) -> np.ndarray:
+    """
+    Parse a column of addresses of the given ADDRTYPE into a uint32 array.
+    Raises ValueError naming the first invalid entry. Use valid_mask() to filter input beforehand.
+    """
+    parsed_values, valid = _parse(values, input_type)
+    if not valid.all():
+        first_invalid = int(np.argmin(valid))
+        raise ValueError(f'Invalid value at index {first_invalid}: {np.asarray(values)[first_invalid]!r}')
+    if reverse:
+        parsed_values = parsed_values.byteswap()
+    return parsed_values
+
+
+def valid_mask(values, input_type: int) -> np.ndarray:
+    """Return a bool array that is True where the value is a valid IPv4 address of the given ADDRTYPE"""
+    return _parse(values, input_type)[1]
+
+
+def _as_byte_matrix(values, input_type: int) -> tuple:
+    """
+    Convert str values to a fixed-width uint8 matrix with one row per value, padded with zero bytes.
+    Returns the matrix and a bool array that is False for values that are too long or not ASCII.
+    """
+    max_length = _MAX_LENGTHS[input_type]
+    str_values = np.asarray(values, dtype=np.str_).ravel()
+    valid = np.char.str_len(str_values) <= max_length
+    str_values = np.where(valid, str_values, '')
+    try:
+        byte_values = str_values.astype(f'S{max_length}')
+    except UnicodeEncodeError:
+        byte_values = np.array(
+            [value.encode('ascii', 'replace') for value in str_values.ravel()], dtype=f'S{max_length}'
+        )
+    return byte_values.view(np.uint8).reshape(-1, max_length), valid.ravel()
+
+
+def _parse(values, input_type: int) -> tuple:
+    """Parse values to a uint32 array, returning it with a bool array marking which values were valid"""
+    if input_type == ADDRTYPE.DEC:
+        array_values = np.asarray(values)
+        if array_values.dtype.kind in 'iu':
+            array_values = array_values.ravel()
+            valid = (array_values >= 0) & (array_values <= V4MAXVAL)
+            return np.where(valid, array_values, 0).astype(np.uint32), valid
+        return _parse_dec(*_as_byte_matrix(values, input_type))
+    elif input_type == ADDRTYPE.HEX:
+        return _parse_hex(*_as_byte_matrix(values, input_type))
+    elif input_type == ADDRTYPE.DOTTED:
+        return _parse_dotted(*_as_byte_matrix(values, input_type))
+    else:
+        raise ValueError(f'input_type of {input_type} is not valid')
+
+
+def _parse_dec(byte_matrix: np.ndarray, valid: np.ndarray) -> tuple:
+    lengths = np.count_nonzero(byte_matrix, axis=1)
+    digits = byte_matrix.astype(np.int64) - ord('0')
+    padding = (byte_matrix == 0)
+    valid &= (lengths > 0) & np.all(padding | ((digits >= 0) & (digits <= 9)), axis=1)
+    # padding is only allowed after the digits
+    valid &= np.all(padding == (np.arange(byte_matrix.shape[1]) >= lengths[:, np.newaxis]), axis=1)
+
+    accumulated = np.zeros(len(byte_matrix), dtype=np.int64)
+    for column in range(byte_matrix.shape[1]):
+        is_digit = ~padding[:, column]
+        accumulated = np.where(is_digit, (accumulated * 10) + digits[:, column], accumulated)
+    valid &= (accumulated <= V4MAXVAL)
+    return np.where(valid, accumulated, 0).astype(np.uint32), valid
+
+
+def _parse_dotted(byte_matrix: np.ndarray, valid: np.ndarray) -> tuple:
+    row_count = len(byte_matrix)
+    accumulated = np.zeros(row_count, dtype=np.uint32)
+    octet = np.zeros(row_count, dtype=np.uint32)
+    octet_digits = np.zeros(row_count, dtype=np.uint8)
+    dot_count = np.zeros(row_count, dtype=np.uint8)
+    ended = np.zeros(row_count, dtype=bool)
+
+    # Walk the columns as a state machine, processing every row at once
+    for column in range(byte_matrix.shape[1]):
+        chars = byte_matrix[:, column]
+        is_end = (chars == 0)
+        is_dot = (chars == ord('.'))
+        is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+        valid &= ended | is_end | is_dot | is_digit
+        # nothing may follow the end of the value
+        valid &= ~(ended & ~is_end)
+
+        finished_octet = (is_dot | is_end) & ~ended
+        valid &= ~finished_octet | ((octet_digits > 0) & (octet <= 255))
+        accumulated = np.where(finished_octet, (accumulated << 8) | (octet & 0xff), accumulated)
+        dot_count += is_dot
+        octet = np.where(finished_octet, 0, np.where(is_digit, (octet * 10) + (chars - ord('0')), octet))
+        octet_digits = np.where(finished_octet, 0, octet_digits + is_digit)
+        valid &= (octet_digits <= 3)
+        ended |= is_end
+
+    # Values that fill the full width have not been terminated yet
+    unterminated = ~ended
+    valid &= ~unterminated | ((octet_digits > 0) & (octet <= 255))
+    accumulated = np.where(unterminated, (accumulated << 8) | (octet & 0xff), accumulated)
+    valid &= (dot_count == 3)
+    return np.where(valid, accumulated, 0).astype(np.uint32), valid
+
+
+def _parse_hex(byte_matrix: np.ndarray, valid: np.ndarray) -> tuple:
+    # Drop an optional 0x/0X prefix by shifting those rows left two columns
+    has_prefix = (byte_matrix[:, 0] == ord('0')) & ((byte_matrix[:, 1] | 0x20) == ord('x'))
+    shifted = np.zeros_like(byte_matrix)
+    shifted[:, :-2] = byte_matrix[:, 2:]
+    # Without a prefix only 8 digits are allowed
+    valid &= has_prefix | (byte_matrix[:, 8] == 0)
+    byte_matrix = np.where(has_prefix[:, np.newaxis], shifted, byte_matrix)[:, :8]
+
+    lengths = np.count_nonzero(byte_matrix, axis=1)
+    padding = (byte_matrix == 0)
+    nibbles = _HEX_VALUES[byte_matrix]
+    valid &= (lengths > 0) & np.all(padding | (nibbles < 16), axis=1)
+    valid &= np.all(padding == (np.arange(8) >= lengths[:, np.newaxis]), axis=1)
+
+    accumulated = np.zeros(len(byte_matrix), dtype=np.uint32)
+    for column in range(8):
+        is_digit = ~padding[:, column]
+        accumulated = np.where(is_digit, (accumulated << 4) | (nibbles[:, column] & 0xf), accumulated)
+    return np.where(valid, accumulated, 0).astype(np.uint32), valid
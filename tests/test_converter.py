@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+# Copyright (C) 2014, 2018, 2019 Brandon M. Pace
+#
+# This file is part of Quick IP Converter
+#
+# Quick IP Converter is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# Quick IP Converter is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Quick IP Converter.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+
+"""
+Regression checks for libIPconv.Converter. Run from the repository root:
+    python -m unittest discover tests
+"""
+
+
+import unittest
+from libIPconv import ADDRTYPE, Converter, InputTooLargeError, get_max_digits
+
+
+class ConverterTest(unittest.TestCase):
+    def test_previous_value_converts_after_too_large_value(self):
+        converter = Converter()
+        results = []
+        converter.register_callback(results.append, ADDRTYPE.HEX)
+
+        self.assertTrue(converter.set_value('5', ADDRTYPE.DEC))
+        with self.assertRaises(InputTooLargeError):
+            converter.set_value('9' * (get_max_digits() + 1), ADDRTYPE.DEC)
+        # The oversized value was never applied, so going back to '5' is a change that runs the callbacks again
+        self.assertTrue(converter.set_value('5', ADDRTYPE.DEC))
+        self.assertEqual(results, ['05', '05'])
+        self.assertEqual(converter.get_value(ADDRTYPE.HEX), '05')
+
+    def test_repeated_value_is_skipped(self):
+        converter = Converter()
+        self.assertTrue(converter.set_value('5', ADDRTYPE.DEC))
+        self.assertFalse(converter.set_value('5', ADDRTYPE.DEC))
+
+
+if __name__ == '__main__':
+    unittest.main()